@@ -2,20 +2,39 @@
 import pandas as pd
 from pandas.core.array_algos.transforms import shift
 from pandas.core.frame import DataFrame
-from typing import Dict
+from typing import Dict, TYPE_CHECKING
 import numpy as np
-import tqdm
 import scipy.signal
 import scipy.optimize
 import scipy.special
-import matplotlib.pyplot as plt
-from matplotlib.axes import Axes
-from matplotlib.figure import Figure
 import warnings
-import seaborn as sns
-from datetime import datetime
+import functools
+from time import perf_counter
 
 from . import helpers
+from . import io
+
+if TYPE_CHECKING:
+    from matplotlib.axes import Axes
+    from matplotlib.figure import Figure
+
+def _instrumented(stage):
+    """Record the wall time of a `Chromatogram` method in `self.stats` and `self.log`, if enabled."""
+    def decorator(method):
+        @functools.wraps(method)
+        def wrapper(self, *args, **kwargs):
+            if self.stats is None and self.log is None:
+                return method(self, *args, **kwargs)
+            start = perf_counter()
+            try:
+                return method(self, *args, **kwargs)
+            finally:
+                seconds = perf_counter() - start
+                if self.stats is not None:
+                    self.stats.record_stage(stage, seconds)
+                self._log("stage", name=stage, seconds=seconds)
+        return wrapper
+    return decorator
 
 # Create Class object for Chromatogram
 
@@ -27,15 +46,18 @@ class Chromatogram:
     ----------
     df : `pandas.core.frame.Dataframe`
         A pandas dataframe containing the chromatogram data, minimum columns
-        with time and signal intensity
+        with time and signal intensity. The data is held as one contiguous
+        numpy array per column and the dataframe is built from views of
+        them on first access.
     peaks : `pandas.core.frame.Dataframe`
         A pandas dataframe containing the inferred properties;
         retention time, scale, skew, amplitude, and total area of
         individual peaks of the chromatogram.
-    chromo_matrix : `numpy.ndarray`
-        Matrix array where each row corresponds to time, each column to
-        a probability density value for each individual peak. Used in the
-        `plot` method.
+    unmixed_chromatograms : `helpers.UnmixedPeaks`
+        Matrix where each row corresponds to time, each column to the
+        reconstructed signal of an individual peak, stored only over each
+        peak's support. Used in the `show` method, `toarray()` gives the
+        dense matrix.
     """
 
     def __init__(
@@ -43,6 +65,10 @@ class Chromatogram:
             file: str | DataFrame,
             crop_window: bool = None,
             cols: Dict[str, str] = {"time": "time", "signal": "signal"},
+            dtype: type = np.float64,
+            log: "io.RunLog | None" = None,
+            run_id=None,
+            copy: bool = True,
     ) -> None:
         """
         Parameters
@@ -59,6 +85,16 @@ class Chromatogram:
             The rentention time crop window of the chromatogram to be
             analyzed. If None, then the whole time range is used instead.
         :param cols:
+        :param dtype: `numpy.dtype`
+            Floating point type the time and signal are stored as, e.g.
+            `numpy.float32` to halve the memory of long runs.
+        :param log: `io.RunLog`, optional
+            Run log to record processing steps in, see `enable_log`.
+        :param run_id: optional
+            Identifier added to every log record of this chromatogram.
+        :param copy: `bool`
+            If False, time and signal columns already of type `dtype` are
+            used without copying. They are never modified.
         """
 
         # Check if file is dataframe
@@ -71,16 +107,21 @@ class Chromatogram:
         self.time_col = cols["time"]
         self.signal_col = cols["signal"]
 
-        # Load chromotagram and other components needed.
-        chromatogram_dataframe = file.copy()
-        self.df = chromatogram_dataframe
-
-        # The average timestep in the chromatogram, ideally should be identical to
-        # the values in the chromatogram data. Determine decimal place to ensure
-        # there is no float-point precision issues
+        # Load chromotagram as one contiguous array per column. Time and signal
+        # are copied once so the caller's dataframe is never modified, other
+        # columns are kept as they are.
+        self._arrays = {
+            col: (
+                np.array(file[col].to_numpy(), dtype=dtype, copy=copy or None)
+                if col in (self.time_col, self.signal_col)
+                else file[col].to_numpy()
+            )
+            for col in file.columns
+        }
+        self._index = file.index
+        self._df = None
 
-        self._timestep = np.mean(np.diff(chromatogram_dataframe[self.time_col].values))
-        self._timestep_precision = int(np.abs(np.ceil(np.log10(self._timestep))))
+        self._set_timestep()
 
         # Define variables that are used by other methods/functions
 
@@ -90,14 +131,55 @@ class Chromatogram:
         self.peaks = None # df for peak properties
         self.known_peaks = None
         self._peak_indices = None
+        self.windows = None
+        self._window_df = None
+        self.template_report = None
+        self._norm_range = (None, None)
+        self._open_end = False
+        self._live = None
+        self._model = "skewnorm" # peak shape of the last fit, see `deconvolve_peaks`
+        self.stats = None # helpers.RunStats, see `enable_stats`
+        self.log = log # io.RunLog, see `enable_log`
+        self.run_id = run_id
 
         if crop_window is not None:
             self.crop(crop_window)
-        else:
-            self.df = chromatogram_dataframe
+
+    def _set_timestep(self) -> None:
+        # The average timestep in the chromatogram, ideally should be identical to
+        # the values in the chromatogram data. Determine decimal place to ensure
+        # there is no float-point precision issues. Empty chromatograms, started
+        # with `append()`, get it from their first samples.
+        time = self._arrays[self.time_col]
+        if len(time) < 2:
+            self._timestep, self._timestep_precision = np.nan, 0
+            return
+        self._timestep = np.mean(np.diff(time), dtype=np.float64)
+        self._timestep_precision = int(np.abs(np.ceil(np.log10(self._timestep))))
+
+    @property
+    def df(self) -> DataFrame:
+        """The chromatogram as a dataframe of views of the column arrays, built on first access."""
+        if self._df is None:
+            self._df = pd.DataFrame(self._arrays, index=self._index, copy=False)
+        return self._df
+
+    @df.setter
+    def df(self, frame: DataFrame) -> None:
+        self._arrays = {col: frame[col].to_numpy() for col in frame.columns}
+        self._index = frame.index
+        self._df = frame
+
+    def __getstate__(self):
+        # Logs and stats stay in the process they were enabled in, e.g. when
+        # chromatograms are sent to worker processes
+        state = self.__dict__.copy()
+        state.update(_df=None, log=None, stats=None)
+        return state
 
     def __repr__(self):
-        trange = f"(t: {self.df[self.time_col].values[0]} - {self.df[self.time_col].values[-1]})"
+        time = self._arrays[self.time_col]
+        trange = f"(t: {time[0]} - {time[-1]})" if len(time) else "(empty)"
 
         rep = f"""                  Chromatogram REPORT                 """
         if self._crop_offset > 0:
@@ -106,8 +188,7 @@ class Chromatogram:
             rep += f"\n\t Baseline Subtracted\t\t\t\u2713"
         if self._peak_indices is not None:
             rep += f"\n\t {len(self._peak_indices)} Peak(s) Detected\t\t\t\u2713\n"
-            # Use iloc for positional indexing
-            peak_times = self.df.iloc[self._peak_indices][self.time_col].values
+            peak_times = time[self._peak_indices]
             rep += "\t\t\t→ Peak times: " + ", ".join(f"{t:.3f}" for t in peak_times)
 
         rep = "                  Chromatogram REPORT                 "
@@ -117,14 +198,9 @@ class Chromatogram:
             rep += "\n\t{:<40} {:>5}".format("Baseline Subtracted", "\u2713")
         if self._peak_indices is not None:
             rep += "\n\t{:<40} {:>5}".format(f"{len(self._peak_indices)} Peak(s) Detected", "\u2713")
-            peak_times = self.df.iloc[self._peak_indices][self.time_col].values
+            peak_times = time[self._peak_indices]
             rep += "\n\t\t\t→ Peak times: " + ", ".join(f"{t:.3f}" for t in peak_times)
 
-        with open("chromatogram_report.log", "a") as log_file:
-
-            log_file.write(f"\n--- {datetime.now()} ---\n")
-            # log_file.write(rep)
-
         return rep
 
     def crop(self,
@@ -154,30 +230,35 @@ class Chromatogram:
                 f"First index (start) is larger than second index (end)"
             )
 
-        # Apply the crop
-        self.df = self.df[
-            (self.df[self.time_col] >= crop_window[0])
-        & (self.df[self.time_col] <= crop_window[1])
-        ]
+        # Apply the crop as a slice of every column, the time being sorted
+        time = self._arrays[self.time_col]
+        start = np.searchsorted(time, crop_window[0], side="left")
+        stop = np.searchsorted(time, crop_window[1], side="right")
+        self._arrays = {col: values[start:stop] for col, values in self._arrays.items()}
+        self._index = self._index[start:stop]
+        self._df = None
+        self._log("crop", start=crop_window[0], end=crop_window[1], n_points=int(stop - start))
         self._crop_offset = int(crop_window[0] / self._timestep)
 
         if return_df:
             return self.df
 
+    @_instrumented("_assign_windows")
     def _assign_windows(self,
                          known_peaks=[],
                          tolerance=0.5,
                          prominence=0.01,
                          rel_height=1,
                          buffer=0,
-                        peak_kwargs={}
-    ) -> pd.DataFrame:
+                        peak_kwargs={},
+                        merge_windows=False,
+    ) -> helpers.WindowIndex:
 
         if not (0 <= rel_height <= 1):
             raise ValueError("`rel_height` must be in [0, 1]")
 
-        intensity = self.df[self.signal_col].values
-        self.normint = helpers.normalize_signal(intensity)
+        intensity = self._arrays[self.signal_col]
+        self.normint = helpers.normalize_signal(intensity, *self._norm_range)
         self._peak_indices = helpers._detect_peaks(self.normint, prominence, peak_kwargs)
 
         amps = np.sign(intensity[self._peak_indices])
@@ -194,18 +275,32 @@ class Chromatogram:
                 _left[sign_mask] = l_ips[sign_mask]
                 _right[sign_mask] = r_ips[sign_mask]
 
-        ranges = helpers.build_peak_ranges(_left, _right, len(self.normint), buffer)
-        ranges = helpers.remove_subset_ranges(ranges)
-        self.ranges = ranges
+        starts, stops = helpers.build_peak_ranges(_left, _right, len(self.normint), buffer)
+        starts, stops = helpers.remove_subset_ranges(starts, stops, merge=merge_windows)
+        self.ranges = [range(start, stop) for start, stop in zip(starts, stops)]
 
-        window_df = helpers.build_window_df(self, self.df, ranges)
-        window_df = helpers.assign_background_windows(window_df)
+        self.windows = helpers.build_window_index(starts, stops, len(self.normint))
+        self._window_df = None
 
-        self.window_df = window_df
-        self.window_props = helpers.extract_window_props(self, window_df, _widths)
-        return window_df
+        self._widths = _widths
+        self.window_props = helpers.extract_window_props(self, self.windows, _widths)
 
+        # While acquiring, a window running into the end of the trace is not complete yet
+        if self._open_end:
+            for k, (_, stop) in self.windows.peak_spans().items():
+                if stop >= len(self.normint) - 1:
+                    self.window_props[k]["open"] = True
+        return self.windows
 
+    @property
+    def window_df(self) -> DataFrame:
+        """The chromatogram rows assigned to a window, built from `windows` on first access."""
+        if self._window_df is None:
+            self._window_df = self.windows.to_frame(self.df)
+        return self._window_df
+
+
+    @_instrumented("deconvolve_peaks")
     def deconvolve_peaks(
             self,
             verbose=True,
@@ -213,29 +308,161 @@ class Chromatogram:
             integration_window=[],
             max_iter=1_000_000,
             optimizer_kwargs={},
+            analytic_jac=True,
+            n_jobs=1,
+            executor=None,
+            fit_cache=None,
+            method_template=None,
+            model="skewnorm",
+            engine="curve_fit",
+            split_peaks=10,
+            refine_iter=100,
+            time_budget=10.0,
+            fallback=True,
     ):
+        """
+        Fit the peaks of every window with a sum of peak shapes, skew-normal
+        distributions by default.
+
+        Parameters
+        ----------
+        :param verbose: `bool`
+            If True, shows a progress bar over the fitted windows.
+        :param param_bounds: `dict`
+            Optional custom bounds per parameter, see `_adjust_param_bounds`.
+        :param integration_window: `list` [start, stop], optional
+            Time range the reconstructed peaks are integrated over.
+        :param max_iter: `int`
+            Maximum number of function evaluations per window.
+        :param optimizer_kwargs: `dict`
+            Extra keyword arguments passed to `scipy.optimize.curve_fit`.
+        :param analytic_jac: `bool`
+            If True, uses the closed-form Jacobian of the model.
+        :param n_jobs: `int`
+            Number of worker processes the windows are fitted on. 1 fits
+            serially, -1 uses all cores.
+        :param executor: `concurrent.futures.Executor`, optional
+            Executor to fit the windows on instead of a new process pool.
+        :param fit_cache: `helpers.FitCache`, optional
+            Cache of previous window fits. Windows with unchanged data,
+            initial guess, bounds and settings reuse the stored parameters.
+        :param method_template: `MethodTemplate`, optional
+            Fitted peaks of a previous injection of the same method. Peaks
+            matching a template peak start from its parameters with tighter
+            bounds, and `template_report` records the evaluations saved.
+        :param model: `str`
+            Peak shape, `"skewnorm"` (default), `"gaussian"` or `"emg"`
+            (exponentially modified Gaussian), see `helpers.PEAK_MODELS`.
+            Every model has the parameters amplitude (area), location, scale
+            and skew; the Gaussian keeps the skew at 0.
+        :param engine: `str`
+            `"curve_fit"` (default) fits all parameters at once, `"varpro"`
+            solves the amplitudes by bounded linear least squares at every
+            step and optimizes only location, scale and skew, which is more
+            robust on crowded windows.
+        :param split_peaks: `int`, optional
+            Windows with at least this many peaks are split at their weakest
+            overlaps into sub-windows with fewer peaks, fitted separately
+            (and in parallel with `n_jobs`), so it must be at least 2. None
+            fits every window whole.
+        :param refine_iter: `int`
+            Maximum number of evaluations of the joint refit of the two peaks
+            at every seam between sub-windows.
+        :param time_budget: `float`, optional
+            Wall-clock limit in seconds of the fit of every window, together
+            with the `max_iter` limit per attempt. A split window divides it
+            evenly among its sub-window fits and seam refits, so fitted one
+            after another they stay within it. None fits without time limit.
+        :param fallback: `bool`
+            If True, windows that fail or run out of budget are refitted
+            with relaxed bounds, then with Gaussian peaks, and otherwise
+            integrated from the raw signal, see `helpers._fit_escalating`.
+            The `status` column of `peaks` records the step each window
+            ended at. If False, a failed fit raises.
+        """
         if self.window_props is None:
             raise RuntimeError("Run `_assign_windows()` first.")
-
-        iterator = (
-            tqdm.tqdm(self.window_props.items(), desc="Deconvolving mixture")
-            if verbose else self.window_props.items()
+        if model not in helpers.PEAK_MODELS:
+            raise ValueError(f"Unknown peak model '{model}'. Choose from {list(helpers.PEAK_MODELS)}.")
+        if engine not in helpers.FIT_ENGINES:
+            raise ValueError(f"Unknown fit engine '{engine}'. Choose from {list(helpers.FIT_ENGINES)}.")
+        helpers._check_split_peaks(split_peaks)
+        self._model = model
+
+        grid = (self._arrays[self.time_col], integration_window, self._timestep)
+        windows, tasks, template_matches = self._fit_tasks(
+            param_bounds, max_iter, analytic_jac, optimizer_kwargs, method_template, model, engine, split_peaks,
+            time_budget, fallback,
         )
 
-        param_order = ["amplitude", "location", "scale", "skew"]
-        t_range = helpers._generate_time_range(self.df, self.time_col, integration_window, self._timestep)
+        # Fit curves, serially or across one pool of workers shared with the seam refits
+        with helpers.shared_executor(n_jobs, executor) as pool:
+            progress = helpers.progress_bar(total=len(tasks), desc="Deconvolving mixture") if verbose else None
+            try:
+                results = helpers.fit_windows(
+                    tasks,
+                    n_jobs=n_jobs,
+                    executor=pool,
+                    callback=progress.update if progress is not None else None,
+                    cache=fit_cache,
+                )
+            finally:
+                if progress is not None:
+                    progress.close()
 
-        peak_props = {}
+            windows, results, template_matches = self._join_split(
+                windows, results, template_matches, refine_iter, analytic_jac, optimizer_kwargs,
+                model, n_jobs=n_jobs, executor=pool, fit_cache=fit_cache, time_budget=time_budget, fallback=fallback,
+            )
+        peak_props = self._collect_fits(windows, results, grid)
+
+        integrated = [k for k, window in peak_props.items() if any(p["status"] == "integrated" for p in window.values())]
+        if integrated:
+            warnings.warn(
+                f"\nPeaks of windows {integrated} could not be fitted within their budget "
+                "and were integrated from the raw signal."
+            )
+
+        self._peak_props = peak_props
+        if method_template is not None:
+            self.template_report = method_template.report(
+                [k for k, _ in windows], template_matches, [info for _, info in results]
+            )
+        return peak_props
+
+
+    def _fit_tasks(self, param_bounds, max_iter, analytic_jac, optimizer_kwargs, method_template=None,
+                   model="skewnorm", engine="curve_fit", split_peaks=None, time_budget=None, fallback=False):
+        """
+        Initial guesses and bounds of every window containing peaks. Windows
+        with `split_peaks` or more peaks are fitted as sub-windows, see
+        `helpers.split_window`, sharing the `time_budget` of the window with
+        its seam refits, see `helpers._split_budget`. Returns the
+        `(window_id, props)` pairs, with the sub-window props for split
+        windows, their `helpers.fit_windows` tasks and the template matches
+        of their peaks.
+        """
+        param_order = ["amplitude", "location", "scale", "skew"]
         self._param_bounds = []
         self._p0 = []
+        template_matches = []
 
-        for k, v in iterator:
-            if v["num_peaks"] == 0:
+        units = []
+        for k, v in self.window_props.items():
+            if v["num_peaks"] == 0 or v.get("open", False):
                 continue
-
-            window_dict = {}
+            if split_peaks is not None and v["num_peaks"] >= split_peaks:
+                subs = helpers.split_window(v, split_peaks)
+                budget = helpers._split_budget(time_budget, len(subs))
+                units.extend((k, sub, budget) for sub in subs)
+            else:
+                units.append((k, v, time_budget))
+
+        windows, budgets = [], []
+        for k, v, budget in units:
             p0 = []
             bounds_lower, bounds_upper = [], []
+            matches = []
 
             if v["num_peaks"] >= 10:
                 warnings.warn(
@@ -247,54 +474,205 @@ class Chromatogram:
                 peak_p0 = [v["amplitude"][i], v["location"][i], v["width"][i] / 2, 0]
                 default_bounds = helpers._default_param_bounds(*peak_p0[:3], v["time_range"].min(), v["time_range"].max())
 
+                # Warm start from the nearest peak of the method template
+                if method_template is not None:
+                    peak_p0, default_bounds, match = method_template.seed(peak_p0, default_bounds)
+                    matches.append(match)
+
                 # Optional tweaks from `param_bounds`
                 if param_bounds:
                     custom = {
-                        key: param_bounds.get(key, default_bounds[key])
-                        for key in param_order
+                        key: param_bounds[key]
+                        for key in param_order if key in param_bounds
                     }
-                    bounds = _adjust_param_bounds(peak_p0, custom, default_bounds, param_order)
+                    bounds = helpers._adjust_param_bounds(peak_p0, custom, default_bounds, param_order)
                 else:
                     bounds = {"lower": [default_bounds[k][0] for k in param_order],
                               "upper": [default_bounds[k][1] for k in param_order]}
 
+                # Truncated windows (e.g. at the end of the trace) can leave the
+                # width-based guess outside of the bounds
+                peak_p0 = np.clip(peak_p0, bounds["lower"], bounds["upper"]).tolist()
+
                 p0.extend(peak_p0)
                 bounds_lower.extend(bounds["lower"])
                 bounds_upper.extend(bounds["upper"])
 
             self._p0.append(p0)
             self._param_bounds.append((bounds_lower, bounds_upper))
+            windows.append((k, v))
+            budgets.append(budget)
+            template_matches.append(matches)
 
-            # Fit curves
-            popt, _ = scipy.optimize.curve_fit(
-                helpers._sum_skewnorms,
-                v["time_range"],
-                v["signal"],
-                p0=p0,
-                bounds=(bounds_lower, bounds_upper),
-                maxfev=max_iter,
-                **optimizer_kwargs
-            )
+        tasks = [
+            (v["time_range"], v["signal"], p0, bounds, max_iter, analytic_jac, optimizer_kwargs, model, engine, budget, fallback)
+            for (_, v), p0, bounds, budget in zip(windows, self._p0, self._param_bounds, budgets)
+        ]
+        return windows, tasks, template_matches
 
+    def _join_split(self, windows, results, template_matches, refine_iter, analytic_jac, optimizer_kwargs,
+                    model, n_jobs=1, executor=None, fit_cache=None, time_budget=None, fallback=False):
+        """
+        Reassemble the sub-windows of split windows, then refit jointly the
+        two peaks at every seam between sub-windows, with every other peak of
+        the window held fixed, for at most `refine_iter` evaluations and
+        within their share of the `time_budget` of the window, see
+        `helpers._split_budget`. Seams are refined in two rounds of non-adjacent
+        seams, each round as one `helpers.fit_windows` call. With `fallback`,
+        a seam refit that does not end at the first step of the escalation
+        ladder leaves the seam peaks as they were, without it a failed refit
+        raises.
+
+        Peaks keep the status of the (sub-)window they were fitted in, and the
+        peaks of integrated (sub-)windows are integrated over its span only,
+        see `helpers._integrate_window`. Seams next to an integrated
+        sub-window are not refined. The fit information of a split window
+        has the last status of `helpers.FIT_STATUSES` among its sub-windows.
+        """
+        joined = self._join_subs(windows, results, template_matches)
+        for parity in (0, 1):
+            seams, tasks = self._seam_tasks(
+                joined, parity, refine_iter, analytic_jac, optimizer_kwargs, model, time_budget, fallback
+            )
+            if tasks:
+                self._apply_seams(joined, seams, helpers.fit_windows(tasks, n_jobs=n_jobs, executor=executor, cache=fit_cache))
+        return self._joined(joined)
+
+    def _join_subs(self, windows, results, template_matches) -> Dict:
+        """Fits of the windows of `_fit_tasks`, with split windows reassembled from their sub-windows."""
+        joined = {}
+        for (k, v), (popt, info), p0, bounds, matches in zip(windows, results, self._p0, self._param_bounds, template_matches):
+            status = np.full(v["num_peaks"], info["status"], dtype=object)
+            areas, maxima = np.full(v["num_peaks"], np.nan), np.full(v["num_peaks"], np.nan)
+            if info["status"] == "integrated":
+                # Recomputed from the same segments as in the worker
+                popt, areas, maxima = helpers._integrate_window(v["time_range"], v["signal"], np.asarray(p0)[1::4])
+            if "peaks" not in v:
+                joined[k] = {
+                    "props": v, "popt": np.asarray(popt), "info": info, "p0": p0, "bounds": bounds, "matches": matches,
+                    "status": status, "areas": areas, "maxima": maxima,
+                }
+                continue
+            if k not in joined:
+                parent = self.window_props[k]
+                n = 4 * parent["num_peaks"]
+                joined[k] = {
+                    "props": parent, "popt": np.zeros(n), "p0": np.zeros(n),
+                    "bounds": (np.zeros(n), np.zeros(n)), "matches": [None] * parent["num_peaks"],
+                    "info": {"nfev": 0, "seconds": 0.0, "converged": True, "status": "fitted", "sub_windows": 0},
+                    "status": np.full(parent["num_peaks"], "fitted", dtype=object),
+                    "areas": np.full(parent["num_peaks"], np.nan), "maxima": np.full(parent["num_peaks"], np.nan),
+                    "subs": [],
+                }
+            entry = joined[k]
+            idx = (4 * v["peaks"][:, None] + np.arange(4)).ravel()
+            entry["popt"][idx] = popt
+            entry["p0"][idx] = p0
+            entry["status"][v["peaks"]] = status
+            entry["areas"][v["peaks"]], entry["maxima"][v["peaks"]] = areas, maxima
+            entry["bounds"][0][idx], entry["bounds"][1][idx] = bounds
+            for i, match in zip(v["peaks"], matches or [None] * len(v["peaks"])):
+                entry["matches"][i] = match
+            entry["info"]["nfev"] += info["nfev"]
+            entry["info"]["seconds"] += info["seconds"]
+            entry["info"]["converged"] &= info["converged"]
+            entry["info"]["status"] = max(entry["info"]["status"], info["status"], key=helpers.FIT_STATUSES.index)
+            entry["info"]["sub_windows"] += 1
+            if info.get("cached"):
+                entry["info"]["cached"] = True
+            entry["subs"].append((v, info["status"]))
+        return joined
+
+    @staticmethod
+    def _seam_tasks(joined, parity, refine_iter, analytic_jac, optimizer_kwargs, model, time_budget, fallback):
+        """`helpers.fit_windows` tasks of the seams of round `parity` of `_join_split`, and their targets."""
+        peak_model = helpers.PEAK_MODELS[model]
+        seams, tasks = [], []
+        for k, entry in joined.items():
+            subs = entry.get("subs", [])
+            budget = helpers._split_budget(time_budget, len(subs))
+            for g in range(parity, len(subs) - 1, 2):
+                (left, left_status), (right, right_status) = subs[g], subs[g + 1]
+                if "integrated" in (left_status, right_status):
+                    continue
+                pair = np.array([left["peaks"][-1], right["peaks"][0]])
+                idx = (4 * pair[:, None] + np.arange(4)).ravel()
+                x = np.concatenate([left["time_range"], right["time_range"][1:]])
+                y = np.concatenate([left["signal"], right["signal"][1:]])
+
+                # The other peaks of the window are held at their current fit
+                params = entry["popt"].reshape(-1, 4)
+                fixed = np.zeros_like(x, dtype=float)
+                for i in np.setdiff1d(np.arange(len(params)), pair):
+                    start, stop = peak_model.support(x, *params[i], 1e-12 * peak_model.height_bound(params[i][0], params[i][2]))
+                    fixed[start:stop] += peak_model.evaluate(x[start:stop], *params[i])
+
+                lower, upper = entry["bounds"][0][idx].copy(), entry["bounds"][1][idx].copy()
+                lower[1::4], upper[1::4] = x.min(), x.max()
+                p0 = np.clip(entry["popt"][idx], lower, upper)
+                seams.append((k, idx))
+                tasks.append((x, y - fixed, p0, (lower, upper), refine_iter, analytic_jac, optimizer_kwargs, model, "varpro", budget, fallback))
+        return seams, tasks
+
+    @staticmethod
+    def _apply_seams(joined, seams, refined) -> None:
+        """Store the seam refits of `_seam_tasks`, except those that had to escalate."""
+        for (k, idx), (popt, info) in zip(seams, refined):
+            if info["status"] == "fitted":
+                joined[k]["popt"][idx] = popt
+            joined[k]["info"]["nfev"] += info["nfev"]
+            joined[k]["info"]["seconds"] += info["seconds"]
+            if info.get("cached"):
+                joined[k]["info"]["cached"] = True
+
+    def _joined(self, joined):
+        """The windows, fit results and template matches of `joined`, setting the per-window attributes of `_collect_fits`."""
+        windows = [(k, entry["props"]) for k, entry in joined.items()]
+        results = [(entry["popt"], entry["info"]) for entry in joined.values()]
+        self._p0 = [entry["p0"] for entry in joined.values()]
+        self._param_bounds = [entry["bounds"] for entry in joined.values()]
+        template_matches = [entry["matches"] for entry in joined.values()]
+        self._peak_status = [entry["status"] for entry in joined.values()]
+        self._peak_integrals = [(entry["areas"], entry["maxima"]) for entry in joined.values()]
+        return windows, results, template_matches
+
+    def _collect_fits(self, windows, results, grid) -> Dict:
+        """
+        Peak properties of every window from its `helpers.fit_windows` result.
+        Areas and maxima are taken over the integration `grid`, see
+        `helpers._peak_area_max`, or from the raw signal for integrated peaks,
+        see `_join_split`.
+        """
+        peak_props = {}
+        self._fit_info = {}
+        for (k, v), (popt, info), status, (areas, maxima) in zip(windows, results, self._peak_status, self._peak_integrals):
+            self._fit_info[k] = info
+            if self.stats is not None:
+                self.stats.record_window(k, points=len(v["time_range"]), peaks=int(v["num_peaks"]), **info)
+            window_dict = {}
             popt = np.reshape(popt, (v["num_peaks"], 4))
             for i, p in enumerate(popt):
-                recon_signal = helpers._compute_skewnorm(t_range, *p)
-                window_dict[f"peak_{i + 1}"] = {
-                    "amplitude": p[0],
-                    "retention_time": np.round(p[1], decimals=self._timestep_precision),
-                    "scale": p[2],
-                    "alpha": p[3],
-                    "area": recon_signal.sum(),
-                    "reconstructed_signal": recon_signal,
-                    "signal_max": np.max(recon_signal),
-                }
+                if status[i] == "integrated":
+                    area, signal_max = areas[i], maxima[i]
+                else:
+                    area, signal_max = helpers._peak_area_max(grid, *p, model=self._model)
+                window_dict[f"peak_{i + 1}"] = helpers.FittedPeak(
+                    grid,
+                    p,
+                    self._model,
+                    amplitude=p[0],
+                    retention_time=np.round(p[1], decimals=self._timestep_precision),
+                    scale=p[2],
+                    alpha=p[3],
+                    area=area,
+                    signal_max=signal_max,
+                    status=status[i],
+                )
 
             peak_props[k] = window_dict
-
-        self._peak_props = peak_props
         return peak_props
 
-
+    @_instrumented("fit_peaks")
     def fit_peaks(
             self,
             tolerance: float = 0.5,
@@ -302,22 +680,36 @@ class Chromatogram:
             rel_height: float = 1,
             approx_peak_width: float = 5,
             buffer: int = 0,
+            merge_windows: bool = False,
             param_bounds: Dict[str, list] = {},
             integration_window: list[float] = [],
             verbose: bool = True,
             return_peaks: bool = True,
             correct_baseline: bool = True,
+            baseline_engine: str = "vectorized",
             max_iter: int = 1000000,
             precision: int = 9,
             peak_kwargs: Dict = {},
             optimizer_kwargs: Dict = {},
+            n_jobs: int = 1,
+            fit_cache: helpers.FitCache | None = None,
+            method_template: "MethodTemplate | None" = None,
+            model: str = "skewnorm",
+            engine: str = "curve_fit",
+            split_peaks: int | None = 10,
+            refine_iter: int = 100,
+            analytic_jac: bool = True,
+            time_budget: float | None = 10.0,
+            fallback: bool = True,
     ) -> DataFrame:
 
+        helpers._check_split_peaks(split_peaks)
         if correct_baseline and not self._baseline_corrected:
             self.correct_baseline(
                 window=approx_peak_width,
                 verbose=verbose,
-                return_df=False
+                return_df=False,
+                engine=baseline_engine,
             )
 
         # Assign peak windows
@@ -327,18 +719,348 @@ class Chromatogram:
             rel_height=rel_height,
             buffer=buffer,
             peak_kwargs=peak_kwargs,
+            merge_windows=merge_windows,
         )
 
-        # Fit skew-normal peaks
+        # Fit the peaks, skew-normal by default
         peak_props = self.deconvolve_peaks(
             verbose=verbose,
             param_bounds=param_bounds,
             max_iter=max_iter,
             integration_window=integration_window,
-            **optimizer_kwargs,
+            optimizer_kwargs=optimizer_kwargs,
+            n_jobs=n_jobs,
+            fit_cache=fit_cache,
+            method_template=method_template,
+            model=model,
+            engine=engine,
+            split_peaks=split_peaks,
+            refine_iter=refine_iter,
+            analytic_jac=analytic_jac,
+            time_budget=time_budget,
+            fallback=fallback,
         )
 
         # Build dataframe from fitted parameters
+        peak_df = self._tabulate_peaks(peak_props)
+        self.peaks = peak_df
+
+        # Reconstruct unmixed chromatogram matrix
+        self._reconstruct_unmixed(precision)
+        self._log(
+            "peaks",
+            num_peaks=len(peak_df),
+            num_windows=len(self._peak_props),
+            nfev=sum(info["nfev"] for info in self._fit_info.values()),
+            status=peak_df["status"].value_counts().to_dict(),
+        )
+
+        return peak_df if return_peaks else None
+
+    @_instrumented("unmixed_reconstruction")
+    def _reconstruct_unmixed(self, precision: int = 9) -> None:
+        time = self._arrays[self.time_col]
+        params = [
+            [v["amplitude"], v["retention_time"], v["scale"], v["alpha"]]
+            for peaks in self._peak_props.values()
+            for v in peaks.values()
+        ]
+        self.unmixed_chromatograms = helpers.UnmixedPeaks.from_params(time, params, precision=precision, model=self._model)
+
+    def enable_stats(self, callback=None) -> helpers.RunStats:
+        """
+        Record wall time and call counts of every processing stage, and the
+        model evaluations, time, convergence, points and peaks of every
+        fitted window, in `self.stats`.
+
+        Parameters
+        ----------
+        :param callback: `callable`, optional
+            Called with every stage and window record as a dict, e.g. to
+            forward them to a metrics system.
+        """
+        self.stats = helpers.RunStats(callback)
+        return self.stats
+
+    def disable_stats(self) -> None:
+        self.stats = None
+
+    def enable_log(self, log: io.RunLog, run_id=None) -> io.RunLog:
+        """
+        Record crop, baseline correction, peak count and stage timing
+        entries of this chromatogram in `log`.
+
+        Parameters
+        ----------
+        :param log: `io.RunLog`
+            Log the records are added to, can be shared by many chromatograms.
+        :param run_id: optional
+            Identifier added to every record of this chromatogram.
+        """
+        self.log = log
+        self.run_id = run_id
+        return log
+
+    def disable_log(self) -> None:
+        self.log = None
+
+    def _log(self, event: str, **fields) -> None:
+        if self.log is not None:
+            self.log.record(event, run_id=self.run_id, **fields)
+
+    def append(self, time, signal, **fit_kwargs) -> DataFrame:
+        """
+        Append newly acquired samples and update the fitted peaks incrementally,
+        for showing results while a run is still acquiring.
+
+        The first call runs `fit_peaks` on the whole trace with `fit_kwargs`,
+        which are kept for later calls. The chromatogram may start empty, the
+        first call then has to bring at least two samples. Later calls
+        recompute the baseline only over the tail of the trace that new
+        samples can change, see `_live_baseline`, then re-detect and re-fit
+        only the windows after the last finalized one. Peak windows ending
+        more than two approximate peak widths before the end of the trace
+        are finalized and left frozen, as is the background before the first
+        unfinished window, so the cost of an update follows the new data
+        rather than the run length. A window still running into the end of
+        the trace is only fitted once more data closes it. Frozen windows
+        are detected again if the signal range widens until one of their
+        peaks falls below `prominence`, see `_unfreeze_live`.
+
+        The cost only follows the new data while the baseline tail, about
+        `n_iter ** 2 / 2` samples for the `n_iter` SNIP iterations of the
+        baseline window (half its length in samples), is small compared with
+        the run. A 5 minute window at 20 Hz already spans about 4.5 million
+        samples, and every update then recomputes the baseline of the whole
+        trace.
+
+        Parameters
+        ----------
+        :param time: `numpy.ndarray`
+            Retention times of the new samples.
+        :param signal: `numpy.ndarray`
+            Raw signal of the new samples.
+        :param fit_kwargs:
+            Keyword arguments for `fit_peaks`, only accepted on the first call.
+
+        Returns
+        -------
+        peaks : `pandas.core.frame.Dataframe`
+            The peak table of the trace acquired so far.
+        """
+        time = np.asarray(time, dtype=float)
+        signal = np.asarray(signal, dtype=float)
+        if len(time) != len(signal):
+            raise ValueError("`time` and `signal` must have the same length.")
+
+        if self._live is None:
+            return self._start_live(time, signal, fit_kwargs)
+        if fit_kwargs:
+            raise RuntimeError("Fit settings are fixed by the first call to `append()`.")
+        if not len(time):
+            return self.peaks
+
+        live = self._live
+        columns = live["columns"]
+        n_old = columns.n
+        columns.append(len(time), **{self.time_col: time, live["raw_col"]: signal})
+        if live["settings"].get("correct_baseline", True):
+            self._live_baseline(n_old)
+
+        # Running extremes of the signal, for a normalization consistent with the full trace
+        intensity = columns.view(self.signal_col)
+        updated = intensity[max(live["frozen"], n_old - max(live["tail"], live["baseline_tail"])):]
+        live["norm_range"] = (min(live["norm_range"][0], updated.min()), max(live["norm_range"][1], updated.max()))
+        self._unfreeze_live()
+
+        # Re-detect and re-fit the windows after the last frozen one
+        start = live["frozen"]
+        sub = Chromatogram(
+            pd.DataFrame({self.time_col: columns.view(self.time_col)[start:], self.signal_col: intensity[start:]}, copy=False),
+            cols={"time": self.time_col, "signal": self.signal_col},
+        )
+        sub._timestep = self._timestep
+        sub._timestep_precision = self._timestep_precision
+        sub._norm_range = live["norm_range"]
+        sub._open_end = True
+        sub.fit_peaks(**{**live["settings"], "correct_baseline": False, "verbose": False})
+
+        self._merge_live(sub, start)
+        self._freeze_live(sub, start)
+        return self.peaks
+
+    def _start_live(self, time, signal, fit_kwargs) -> DataFrame:
+        if self.peaks is not None or self._baseline_corrected:
+            raise RuntimeError("`append()` must start on a chromatogram that has not been processed yet.")
+
+        raw_col = self.signal_col
+        new = pd.DataFrame({self.time_col: time, raw_col: signal})
+        if len(self._arrays[self.time_col]):
+            new = pd.concat([self.df[[self.time_col, raw_col]], new], ignore_index=True)
+        if len(new) < 2:
+            raise ValueError("The first call to `append()` must leave the chromatogram with at least two samples.")
+        self.df = new
+        self._set_timestep()
+        settings = {"verbose": False, **fit_kwargs}
+        settings.pop("return_peaks", None)
+        self._open_end = True
+        self.fit_peaks(**settings)
+
+        arrays = dict(self._arrays)
+        arrays["window_id"] = self.windows.window_id
+        arrays["is_peak"] = self.windows.is_peak
+        intensity = self._arrays[self.signal_col]
+        n_iter = self._baseline_settings["n_iter"] if self._baseline_corrected else 0
+        self._live = {
+            "settings": settings,
+            "columns": helpers.GrowableColumns(arrays),
+            "raw_col": raw_col,
+            "tail": 2 * max(int(settings.get("approx_peak_width", 5) / self._timestep), 1),
+            "baseline_tail": n_iter * (n_iter + 1) // 2,
+            "norm_range": (intensity.min(), intensity.max()),
+            "frozen": 0,
+            "id_offset": 0,
+            "peak_props": {},
+            "window_props": {},
+            "fit_info": {},
+            "peak_indices": np.array([], dtype=int),
+            "unmixed": [],
+            "checkpoints": [],
+        }
+        self._merge_live(self, 0)
+        self._freeze_live(self, 0)
+        return self.peaks
+
+    def _live_baseline(self, n_old) -> None:
+        """
+        Recompute the baseline over the new samples and the last samples
+        before `n_old` that they can change. SNIP iteration `i` reads the
+        samples `i` apart, so after `n_iter` iterations a sample depends on
+        the samples up to `n_iter * (n_iter + 1) / 2` away, the
+        `baseline_tail`. Recomputing that tail, from one more tail of
+        context, gives the baseline of a one-shot `correct_baseline` over
+        the whole trace, except for the shift of negative signals, which is
+        fixed by the first call to `append()`. The tail grows with the square
+        of `n_iter` and is not capped, so with wide baseline windows it can
+        cover the whole trace.
+        """
+        live = self._live
+        columns = live["columns"]
+        settings = self._baseline_settings
+        tail = live["baseline_tail"]
+
+        # SNIP is recomputed with one extra tail of context and only the last part is replaced
+        replace_start = max(0, n_old - tail)
+        context_start = max(0, replace_start - tail)
+        signal = columns.view(live["raw_col"])[context_start:] - settings["shift"]
+        signal *= np.heaviside(signal, 0)
+        inv_tform = helpers.estimate_background(signal, range(1, settings["n_iter"] + 1), settings["engine"])
+
+        offset = replace_start - context_start
+        columns.view(self.signal_col)[replace_start:] = np.round(signal - inv_tform, decimals=settings["precision"])[offset:]
+        columns.view("estimated_background")[replace_start:] = (inv_tform + settings["shift"])[offset:]
+
+    def _merge_live(self, sub, start) -> None:
+        """Combine the frozen windows with the windows re-fitted on `sub`, which begins at `start`."""
+        live = self._live
+        columns = live["columns"]
+        offset = live["id_offset"]
+
+        sub_ids = sub.windows.window_id
+        columns.view("window_id")[start:] = np.where(sub_ids > 0, sub_ids + offset, 0)
+        columns.view("is_peak")[start:] = sub.windows.is_peak
+
+        self._peak_props = {**live["peak_props"], **{k + offset: v for k, v in sub._peak_props.items()}}
+        self.window_props = {**live["window_props"], **{k + offset: v for k, v in sub.window_props.items()}}
+        self._fit_info = {**live["fit_info"], **{k + offset: v for k, v in sub._fit_info.items()}}
+        self._peak_indices = np.concatenate([live["peak_indices"], sub._peak_indices + start])
+
+        self.df = pd.DataFrame(
+            {col: columns.view(col) for col in columns._data if col not in ("window_id", "is_peak")},
+            copy=False,
+        )
+        self.windows = helpers.WindowIndex(columns.view("window_id"), columns.view("is_peak"))
+        self._window_df = None
+        self.peaks = self._tabulate_peaks(self._peak_props)
+
+        time = columns.view(self.time_col)
+        params = [
+            [v["amplitude"], v["retention_time"], v["scale"], v["alpha"]]
+            for peaks in sub._peak_props.values()
+            for v in peaks.values()
+        ]
+        unmixed = helpers.UnmixedPeaks(len(time))
+        for entry in live["unmixed"]:
+            unmixed.append(*entry)
+        fresh = helpers.UnmixedPeaks.from_params(time, params, precision=live["settings"].get("precision", 9), model=sub._model)
+        for entry in zip(fresh.starts, fresh.values):
+            unmixed.append(*entry)
+        self.unmixed_chromatograms = unmixed
+
+    def _freeze_live(self, sub, start) -> None:
+        """
+        Freeze the windows of `sub` that end more than `tail` samples before
+        the end of the trace, and the background up to the first window that
+        does not.
+        """
+        live = self._live
+        columns = live["columns"]
+        offset = live["id_offset"]
+        limit = columns.n - live["tail"] - start
+
+        spans = sub.windows.peak_spans()
+        frozen = min([limit] + [lo for lo, hi in spans.values() if hi > limit])
+        if frozen <= 0:
+            return
+        done = [k for k, (_, stop) in spans.items() if stop <= frozen]
+
+        # State before this freeze and the weakest peak it freezes, to undo it if the range widens
+        peaks = sub._peak_indices[sub._peak_indices < frozen]
+        lo, hi = live["norm_range"]
+        weakest = helpers._peak_prominences(sub.normint, peaks, live["settings"].get("peak_kwargs", {})).min(initial=np.inf)
+        live["checkpoints"].append((live["frozen"], offset, len(live["unmixed"]), weakest * (hi - lo)))
+
+        time = columns.view(self.time_col)
+        for k in done:
+            if k in sub._peak_props:
+                live["peak_props"][k + offset] = sub._peak_props[k]
+                live["fit_info"][k + offset] = sub._fit_info[k]
+                params = [[v["amplitude"], v["retention_time"], v["scale"], v["alpha"]] for v in sub._peak_props[k].values()]
+                unmixed = helpers.UnmixedPeaks.from_params(time, params, precision=live["settings"].get("precision", 9), model=sub._model)
+                live["unmixed"].extend(zip(unmixed.starts, unmixed.values))
+            live["window_props"][k + offset] = sub.window_props[k]
+
+        live["peak_indices"] = np.concatenate([live["peak_indices"], peaks + start])
+        live["id_offset"] = max(offset, int(columns.view("window_id")[start:start + frozen].max(initial=0)))
+        live["frozen"] = start + frozen
+
+    def _unfreeze_live(self) -> None:
+        """
+        Undo the first freeze whose weakest peak no longer passes the
+        `prominence` threshold of the normalization range, and every later
+        freeze. Peaks are detected relative to the range of the trace acquired
+        so far, so e.g. a run starting on baseline only finds noise peaks until
+        its first real peak widens the range, and those windows are detected
+        again from there.
+        """
+        live = self._live
+        lo, hi = live["norm_range"]
+        threshold = live["settings"].get("prominence", 1e-2) * (hi - lo)
+        checkpoints = live["checkpoints"]
+        stale = next((i for i, (*_, weakest) in enumerate(checkpoints) if weakest < threshold), None)
+        if stale is None:
+            return
+
+        frozen, offset, n_unmixed, _ = checkpoints[stale]
+        del checkpoints[stale:]
+        live["frozen"], live["id_offset"] = frozen, offset
+        for key in ("peak_props", "window_props", "fit_info"):
+            live[key] = {k: v for k, v in live[key].items() if k <= offset}
+        live["peak_indices"] = live["peak_indices"][live["peak_indices"] < frozen]
+        del live["unmixed"][n_unmixed:]
+
+    @staticmethod
+    def _tabulate_peaks(peak_props: Dict) -> DataFrame:
         rows = [
             {
                 "retention_time": p["retention_time"],
@@ -347,39 +1069,52 @@ class Chromatogram:
                 "amplitude": p["amplitude"],
                 "area": p["area"],
                 "signal_maximum": p["signal_max"],
+                "status": p["status"],
             }
             for window in peak_props.values()
             for p in window.values()
         ]
-        peak_df = pd.DataFrame(rows).sort_values(by="retention_time")
+        columns = ["retention_time", "scale", "skew", "amplitude", "area", "signal_maximum", "status"]
+        peak_df = pd.DataFrame(rows, columns=columns).sort_values(by="retention_time")
         peak_df["peak_id"] = np.arange(1, len(peak_df) + 1).astype(int)
-        self.peaks = peak_df
-
-        # Reconstruct unmixed chromatogram matrix
-        time = self.df[self.time_col].values
-        out = np.zeros((len(time), len(peak_df)))
-        i = 0
-        for _, peaks in self._peak_props.items():
-            for _, v in peaks.items():
-                params = [v["amplitude"], v["retention_time"], v["scale"], v["alpha"]]
-                out[:, i] = helpers._compute_skewnorm(time, *params)
-                i += 1
-        self.unmixed_chromatograms = np.round(out, decimals=precision)
-
-        return peak_df if return_peaks else None
+        return peak_df
 
+    @_instrumented("correct_baseline")
     def correct_baseline(
             self,
             window: float = 5,
             return_df: bool = False,
             verbose: bool = True,
             precision: int = 9,
+            engine: str = "vectorized",
     ) -> DataFrame | None:
+        """
+        Estimate and subtract the signal background using SNIP.
+
+        Parameters
+        ----------
+        :param window: `float`
+            Approximate peak width in time units, sets the number of SNIP iterations.
+        :param return_df: `bool`
+            If True, returns the corrected dataframe.
+        :param verbose: `bool`
+            If True, shows a progress bar.
+        :param precision: `int`
+            Decimal places the corrected signal is rounded to.
+        :param engine: `str`
+            SNIP implementation, `"vectorized"` (default) or the reference
+            per-sample `"loop"`. Both give the same result.
+        """
+        if engine not in helpers.SNIP_ENGINES:
+            raise ValueError(
+                f"Unknown baseline engine '{engine}'. Choose from {list(helpers.SNIP_ENGINES)}."
+            )
+
         if self._baseline_corrected:
             warnings.warn(
                 "Baseline has already been corrected. Rerunning on original signal..."
             )
-            self.int_col = self.int_col.split("_corrected")[0]
+            self.signal_col = self.signal_col.split("_corrected")[0]
 
         if (window / self._timestep) < 10:
             raise ValueError(
@@ -389,8 +1124,7 @@ class Chromatogram:
     """
             )
 
-        df = self.df
-        signal = df[self.signal_col].copy()
+        signal = self._arrays[self.signal_col].copy()
 
         # Warning if signal has significant negative values, something wrong
         min_val, max_val = np.min(signal), np.max(signal)
@@ -408,117 +1142,665 @@ class Chromatogram:
         signal *= np.heaviside(signal, 0)
 
         # Apply SNIP transformation (LLS)
-        tform = np.log(np.log(np.sqrt(signal.values + 1) + 1) + 1)
         n_iter = int(((window / self._timestep) - 1) / 2)
 
+        loop = range(1, n_iter + 1)
         if verbose:
             self._bg_correction_progress_state = 1
-            loop = tqdm.tqdm(range(1, n_iter + 1), desc="Performing baseline correction")
+            loop = helpers.progress_bar(loop, desc="Performing baseline correction")
         else:
             self._bg_correction_progress_state = 0
-            loop = range(1, n_iter + 1)
-
-        for i in loop:
-            tform_new = tform.copy()
-            for j in range(i, len(tform) - i):
-                tform_new[j] = min(tform[j], 0.5 * (tform[j + i] + tform[j - i]))
-            tform = tform_new
 
         # Inverse transformation of LLS and subtraction
-        inv_tform = (np.exp(np.exp(tform) - 1) - 1) ** 2 - 1
-        corrected = np.round(signal - inv_tform, decimals=precision)
-        estimated_bg = inv_tform + shift
+        # The working copy of the signal becomes the corrected column
+        inv_tform = helpers.estimate_background(signal, loop, engine)
+        signal -= inv_tform
+        corrected = np.round(signal, decimals=precision, out=signal)
+        inv_tform += shift
+        self._baseline_settings = {"shift": shift, "n_iter": n_iter, "engine": engine, "precision": precision}
+        self._log("baseline", **self._baseline_settings)
 
         # Mark that the column has been corrected
-        self.df = df.assign(
-            **{
-                f"{self.signal_col}_corrected": corrected,
-                "estimated_background": estimated_bg,
-            }
-        )
+        self._arrays[f"{self.signal_col}_corrected"] = corrected
+        self._arrays["estimated_background"] = inv_tform.astype(corrected.dtype, copy=False)
+        self._df = None
         self._baseline_corrected = True
         self.signal_col = f"{self.signal_col}_corrected"
 
         return self.df if return_df else None
 
-    def show(self, time_range: list[float] = []) -> list[Figure, Axes]:
+    def show(self, time_range: list[float] = [], max_points: int | None = 4000) -> "list[Figure, Axes]":
         """
         Displays the chromatogram with mapped peaks and fitted signal.
+        The plotting stack is only imported on the first call.
 
         Parameters
         ----------
         time_range : list[float], optional
             [lower, upper] bounds for time axis zoom.
+        max_points : int, optional
+            Maximum number of points drawn per trace. Longer traces are
+            reduced to the minimum and maximum of each pixel-sized bin, which
+            looks the same. None draws every point.
 
         Returns
         -------
         fig : matplotlib.figure.Figure
         ax : matplotlib.axes._axes.Axes
         """
-        sns.set()
-        fig, ax = plt.subplots()
-        time = self.df[self.time_col].values
+        from . import plotting
+        return plotting.show(self, time_range, max_points)
 
-        # Label setup
-        ylabel_base = self.signal_col.split("_corrected")[0]
+    def _get_peak_label(self, peak_id: int) -> str:
+        """
+        Generate a label for the given peak_id.
 
-        ax.set_xlabel(self.time_col)
-        ax.set_ylabel(f"{ylabel_base}")
+        Parameters
+        ----------
+        peak_id : int
+            The ID of the peak.
+
+        Returns
+        -------
+        label : str
+            Formatted label for plotting.
+        """
+        return f"peak {int(peak_id)}"
 
 
-        # Raw chromatogram
-        ax.plot(time, self.df[self.signal_col], "k-", label="raw chromatogram")
+class MethodTemplate:
+    """
+    Fitted peaks of a reference injection, used to warm start the fits of
+    repeat injections of the same method.
 
-        # Estimated background
-        if "estimated_background" in self.df.columns:
-            ax.plot(
-                time,
-                self.df["estimated_background"],
-                color="blue",
-                label="estimated background",
-                zorder=10,
+    Attributes
+    ----------
+    peaks : `pandas.core.frame.Dataframe`
+        Template peaks with their retention time, scale, skew, amplitude,
+        signal maximum, apex time and the share of model evaluations
+        (`nfev`) their window took to fit. Detected peaks are matched on the
+        apex time, where the peak was detected in the reference injection,
+        as the retention time (the location parameter of the fit) is off
+        the apex for skewed peaks.
+    """
+
+    columns = ["retention_time", "scale", "skew", "amplitude", "signal_maximum", "apex_time", "nfev"]
+
+    def __init__(
+            self,
+            peaks: DataFrame,
+            tolerance: float = 0.5,
+            scale_factor: float = 2,
+            skew_tolerance: float = 2,
+    ) -> None:
+        """
+        Parameters
+        ----------
+
+        :param peaks: `pandas.core.frame.Dataframe`
+            Template peak table with the columns in `MethodTemplate.columns`.
+        :param tolerance: `float`
+            Maximum retention time drift for a peak to match a template peak,
+            also the half-width of its location bounds.
+        :param scale_factor: `float`
+            The scale is bounded to [scale / factor, scale * factor] of the
+            template peak.
+        :param skew_tolerance: `float`
+            The skew is bounded to the template skew +/- this value.
+        """
+        if "apex_time" not in peaks.columns and "retention_time" in peaks.columns:
+            warnings.warn(
+                "\nTemplate peaks have no `apex_time`, matching on `retention_time` instead. "
+                "Skewed peaks may fail to match, rebuild the template with `from_chromatogram`."
             )
+            peaks = peaks.assign(apex_time=peaks["retention_time"])
+        missing = [col for col in self.columns if col not in peaks.columns]
+        if missing:
+            raise ValueError(f"Template peaks are missing column(s) {missing}.")
+        self.peaks = peaks[self.columns].sort_values(by="apex_time").reset_index(drop=True)
+        self.tolerance = tolerance
+        self.scale_factor = scale_factor
+        self.skew_tolerance = skew_tolerance
+
+    @classmethod
+    def from_chromatogram(cls, chrom: Chromatogram, **kwargs) -> "MethodTemplate":
+        """Template from the fitted peaks of `chrom`."""
+        if chrom.peaks is None:
+            raise RuntimeError("Run `fit_peaks()` on the chromatogram first.")
+        rows = []
+        for k, window in chrom._peak_props.items():
+            nfev = chrom._fit_info[k]["nfev"] / len(window)
+            # Apexes as detected, in the order of the fitted peaks of the window
+            apexes = chrom.window_props[k]["location"]
+            for p, apex in zip(window.values(), apexes):
+                rows.append({
+                    "retention_time": p["retention_time"],
+                    "scale": p["scale"],
+                    "skew": p["alpha"],
+                    "amplitude": p["amplitude"],
+                    "signal_maximum": p["signal_max"],
+                    "apex_time": apex,
+                    "nfev": nfev,
+                })
+        return cls(pd.DataFrame(rows, columns=cls.columns), **kwargs)
+
+    def save(self, fname: str) -> None:
+        """Write the template peaks to a csv file."""
+        self.peaks.to_csv(fname, index=False)
+
+    @classmethod
+    def load(cls, fname: str, **kwargs) -> "MethodTemplate":
+        """Read a template saved with `save`."""
+        return cls(pd.read_csv(fname), **kwargs)
+
+    def match(self, apex: float) -> int | None:
+        """Row of the template peak with the apex nearest to `apex`, if within tolerance."""
+        if not len(self.peaks):
+            return None
+        times = self.peaks["apex_time"].values
+        j = np.searchsorted(times, apex)
+        candidates = [i for i in (j - 1, j) if 0 <= i < len(times)]
+        best = min(candidates, key=lambda i: abs(times[i] - apex))
+        return best if abs(times[best] - apex) <= self.tolerance else None
+
+    def seed(self, peak_p0: list, default_bounds: Dict) -> tuple:
+        """
+        Initial guess and bounds of a detected peak from its matching template
+        peak. The detected location of the peak, its apex, is matched to the
+        template apex times. Returns `(p0, bounds, match)`, unchanged with
+        `match` None if no template peak matches or the tightened bounds are
+        empty.
+        """
+        match = self.match(peak_p0[1])
+        if match is None:
+            return peak_p0, default_bounds, None
+
+        t = self.peaks.iloc[match]
+        # Rescale the template amplitude by the observed apex height
+        ratio = peak_p0[0] / t["signal_maximum"] if t["signal_maximum"] else 1
+        amplitude = t["amplitude"] * ratio if ratio > 0 else peak_p0[0]
+        time_min, time_max = default_bounds["location"]
+        bounds = {
+            "amplitude": np.sort([0.01 * amplitude, 100 * amplitude]),
+            "location": [max(time_min, t["retention_time"] - self.tolerance),
+                         min(time_max, t["retention_time"] + self.tolerance)],
+            "scale": [t["scale"] / self.scale_factor,
+                      min(default_bounds["scale"][1], t["scale"] * self.scale_factor)],
+            "skew": [t["skew"] - self.skew_tolerance, t["skew"] + self.skew_tolerance],
+        }
+        if any(lower >= upper for lower, upper in bounds.values()):
+            return peak_p0, default_bounds, None
+
+        p0 = [
+            float(np.clip(value, *bounds[key]))
+            for key, value in zip(["amplitude", "location", "scale", "skew"],
+                                  [amplitude, t["retention_time"], t["scale"], t["skew"]])
+        ]
+        return p0, bounds, match
+
+    def report(self, window_ids: list, matches: list, infos: list) -> DataFrame:
+        """
+        Per window model evaluations of a warm-started fit against the
+        template's evaluations for the same peaks. `nfev_saved` is only
+        given for windows whose peaks all matched the template, and that
+        were fitted rather than taken in part or whole from a `FitCache`,
+        which reports no evaluations.
+        """
+        rows = []
+        for k, window_matches, info in zip(window_ids, matches, infos):
+            matched = [m for m in window_matches if m is not None]
+            complete = len(matched) == len(window_matches)
+            reference = self.peaks["nfev"].values[matched].sum() if complete else np.nan
+            rows.append({
+                "window_id": k,
+                "num_peaks": len(window_matches),
+                "matched": len(matched),
+                "nfev": info["nfev"],
+                "reference_nfev": reference,
+                "nfev_saved": np.nan if info.get("cached") else reference - info["nfev"],
+            })
+        return pd.DataFrame(rows, columns=["window_id", "num_peaks", "matched", "nfev", "reference_nfev", "nfev_saved"])
+
+
+def _process_run(run_id, source, cols, crop_window, load_kwargs, fit_kwargs):
+    """
+    Load, crop and fit a single run. Exceptions are caught and returned so
+    that one bad run does not abort a batch.
+    """
+    try:
+        if isinstance(source, DataFrame):
+            df = source
+        else:
+            df = io.load_chromatogram(source, **load_kwargs)
+        chrom = Chromatogram(df, crop_window=crop_window, cols=cols)
+        peaks = chrom.fit_peaks(**fit_kwargs)
+        return run_id, peaks, None
+    except Exception as e:
+        return run_id, None, f"{type(e).__name__}: {e}"
 
-        # Plot fitted peaks if available
-        if self.peaks is not None:
-            convolved = np.sum(self.unmixed_chromatograms, axis=1)
-            ax.plot(time, convolved, "r--", label="inferred mixture")
-
-            for _, peak in self.peaks.iterrows():
-                peak_id = int(peak["peak_id"])
-                peak_label = self._get_peak_label(peak_id)
-                ax.fill_between(
-                    time,
-                    self.unmixed_chromatograms[:, peak_id - 1],
-                    label=peak_label,
-                    alpha=0.5,
-                )
 
-        # Zoom in on time range/ selected cropped region
-        if len(time_range) == 2:
-            ax.set_xlim(time_range)
-            yvals = self.df[
-                (self.df[self.time_col] >= time_range[0]) &
-                (self.df[self.time_col] <= time_range[1])
-                ][self.int_col]
-            ax.set_ylim(ax.get_ylim()[0], 1.1 * yvals.max())
+class ChromatogramBatch:
+    """
+    Process many chromatograms with one set of `fit_peaks` settings.
 
-        ax.legend() #bbox_to_anchor=(1.5, 1) Can set to static position
-        fig.patch.set_facecolor((0, 0, 0, 0))
-        return [fig, ax]
+    Attributes
+    ----------
+    sources : `dict`
+        The runs to process, keyed by run id. Values are file paths or
+        pandas dataframes.
+    peaks : `pandas.core.frame.Dataframe`
+        Combined peak table of all successful runs, with a `run_id` column.
+    errors : `dict`
+        Error message of every failed run, keyed by run id.
+    """
 
-    def _get_peak_label(self, peak_id: int) -> str:
+    def __init__(
+            self,
+            sources: list | dict,
+            cols: Dict[str, str] = {"time": "time", "signal": "signal"},
+            crop_window: list[float] | None = None,
+            load_kwargs: Dict = {},
+            fit_kwargs: Dict = {},
+    ) -> None:
         """
-        Generate a label for the given peak_id.
+        Parameters
+        ----------
+
+        :param sources: `list` or `dict`
+            File paths and/or pandas dataframes of the chromatograms. A dict
+            assigns run ids explicitly, otherwise paths are used as run ids
+            for files and list positions for dataframes.
+        :param cols: `dict`
+            Time and signal column names, as in `Chromatogram`.
+        :param crop_window: `list` [start, end], optional
+            Retention time crop window applied to every run.
+        :param load_kwargs: `dict`
+            Keyword arguments for `io.load_chromatogram`. The columns
+            default to the values of `cols`.
+        :param fit_kwargs: `dict`
+            Keyword arguments for `Chromatogram.fit_peaks`, shared by all runs.
+        """
+        if isinstance(sources, dict):
+            self.sources = dict(sources)
+        else:
+            self.sources = {
+                (src if isinstance(src, str) else i): src
+                for i, src in enumerate(sources)
+            }
+
+        self.cols = cols
+        self.crop_window = crop_window
+        self.load_kwargs = {"cols": list(cols.values()), **load_kwargs}
+        self.fit_kwargs = {"verbose": False, **fit_kwargs}
+
+        self.peaks = None
+        self.errors = {}
+
+    def run(
+            self,
+            n_jobs: int = 1,
+            executor=None,
+            verbose: bool = True,
+    ) -> DataFrame:
+        """
+        Run load -> crop -> `correct_baseline` -> `fit_peaks` on every source.
 
         Parameters
         ----------
-        peak_id : int
-            The ID of the peak.
+        :param n_jobs: `int`
+            Number of worker processes. 1 processes runs serially, -1 uses
+            all cores.
+        :param executor: `concurrent.futures.Executor`, optional
+            Executor to process the runs on instead of a new process pool.
+        :param verbose: `bool`
+            If True, shows a progress bar over the runs.
 
         Returns
         -------
-        label : str
-            Formatted label for plotting.
+        peaks : `pandas.core.frame.Dataframe`
+            Combined peak table with a `run_id` column.
         """
-        return f"peak {int(peak_id)}"
+        tasks = [
+            (run_id, src, self.cols, self.crop_window, self.load_kwargs, self.fit_kwargs)
+            for run_id, src in self.sources.items()
+        ]
+        progress = helpers.progress_bar(total=len(tasks), desc="Processing runs") if verbose else None
+        try:
+            results = helpers.map_ordered(
+                _process_run,
+                tasks,
+                n_jobs=n_jobs,
+                executor=executor,
+                callback=progress.update if progress is not None else None,
+            )
+        finally:
+            if progress is not None:
+                progress.close()
+
+        tables = []
+        self.errors = {}
+        for run_id, peaks, error in results:
+            if error is not None:
+                self.errors[run_id] = error
+                continue
+            tables.append(peaks.assign(run_id=run_id))
+
+        if self.errors:
+            warnings.warn(f"{len(self.errors)} of {len(tasks)} run(s) failed, see `errors`.")
+
+        if tables:
+            peak_df = pd.concat(tables, ignore_index=True)
+            self.peaks = peak_df[["run_id"] + [c for c in peak_df.columns if c != "run_id"]]
+        else:
+            self.peaks = pd.DataFrame(columns=["run_id"])
+        return self.peaks
+
+
+class MultiChannelChromatogram:
+    """
+    Chromatogram with many signal channels on one time axis, e.g. the
+    wavelengths of a diode-array detector. Baseline correction runs on all
+    channels at once, peak windows are detected once on a reference trace
+    and every channel is fitted within those windows.
+
+    Attributes
+    ----------
+    signals : `numpy.ndarray`
+        Signal matrix of shape (n_points, n_channels), stored column-major
+        so that every channel is contiguous.
+    channels : `list`
+        Channel names, in the column order of `signals`.
+    reference : `Chromatogram`
+        The trace the peak windows were detected on.
+    channel_chromatograms : `dict`
+        Fitted `Chromatogram` of every channel, sharing the arrays of
+        `signals` or `corrected`.
+    peaks : `pandas.core.frame.Dataframe`
+        Fitted peaks of every channel, one row per peak and channel. Peaks
+        share their `peak_id` across channels.
+    """
+
+    def __init__(
+            self,
+            file: DataFrame,
+            channels: list | None = None,
+            time_col: str = "time",
+            crop_window: list[float] | None = None,
+            dtype: type = np.float64,
+    ) -> None:
+        """
+        Parameters
+        ----------
+
+        :param file: `pandas.core.frame.Dataframe`
+            Dataframe with the time column and one column per channel.
+        :param channels: `list`, optional
+            Columns holding the channels. Defaults to every column but the
+            time column.
+        :param time_col: `str`
+            Name of the time column.
+        :param crop_window: `list` [start, end], optional
+            The rentention time crop window of the chromatogram to be
+            analyzed. If None, then the whole time range is used instead.
+        :param dtype: `numpy.dtype`
+            Floating point type the time and signals are stored as.
+        """
+        if type(file) is not pd.core.frame.DataFrame:
+            raise RuntimeError(
+                f"Argument must be a Pandas Dataframe, given file is of type {type(file)}"
+            )
+
+        self.time_col = time_col
+        self.channels = list(channels) if channels is not None else [col for col in file.columns if col != time_col]
+        if not self.channels:
+            raise ValueError("No signal channels given.")
+
+        self.time = np.array(file[time_col].to_numpy(), dtype=dtype)
+        self.signals = np.array(file[self.channels].to_numpy(dtype=dtype), order="F")
+        if crop_window is not None:
+            if len(crop_window) != 2 or crop_window[0] >= crop_window[1]:
+                raise RuntimeError("`crop_window` must be (start, end) with start < end.")
+            start = np.searchsorted(self.time, crop_window[0], side="left")
+            stop = np.searchsorted(self.time, crop_window[1], side="right")
+            self.time = self.time[start:stop]
+            self.signals = self.signals[start:stop]
+
+        self._timestep = np.mean(np.diff(self.time), dtype=np.float64)
+        self._timestep_precision = int(np.abs(np.ceil(np.log10(self._timestep))))
+
+        self.corrected = None
+        self.background = None
+        self.reference = None
+        self.channel_chromatograms = {}
+        self.peaks = None
+
+    def correct_baseline(self, window: float = 5, precision: int = 9) -> None:
+        """
+        Estimate and subtract the background of every channel with SNIP, as
+        one operation on the whole signal matrix. The results are stored in
+        `corrected` and `background`.
+
+        Parameters
+        ----------
+        :param window: `float`
+            Approximate peak width in time units, sets the number of SNIP iterations.
+        :param precision: `int`
+            Decimal places the corrected signals are rounded to.
+        """
+        if (window / self._timestep) < 10:
+            raise ValueError(
+                f"The approximate peak width ({window}) is too small relative to the time "
+                f"sampling interval ({self._timestep})."
+            )
+
+        signal = np.array(self.signals, dtype=float, order="F")
+
+        # Shift every channel by the median of its negative values
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", RuntimeWarning)
+            shift = np.nan_to_num(np.nanmedian(np.where(signal < 0, signal, np.nan), axis=0))
+        signal -= shift
+        signal *= np.heaviside(signal, 0)
+
+        n_iter = int(((window / self._timestep) - 1) / 2)
+        inv_tform = helpers.estimate_background(signal, range(1, n_iter + 1))
+        signal -= inv_tform
+        np.round(signal, decimals=precision, out=signal)
+        inv_tform += shift
+
+        self.corrected = signal.astype(self.signals.dtype, copy=False)
+        self.background = inv_tform.astype(self.signals.dtype, copy=False)
+        self._baseline_settings = {"shift": shift, "n_iter": n_iter, "precision": precision}
+
+    def _channel(self, signals: np.ndarray, j: int) -> Chromatogram:
+        """Chromatogram of channel `j` of `signals`, without copying its data."""
+        name = self.channels[j]
+        return Chromatogram(
+            pd.DataFrame({self.time_col: self.time, name: signals[:, j]}, copy=False),
+            cols={"time": self.time_col, "signal": name},
+            dtype=signals.dtype,
+            copy=False,
+        )
+
+    def fit_peaks(
+            self,
+            reference: str = "max",
+            tolerance: float = 0.5,
+            prominence: float = 1e-2,
+            rel_height: float = 1,
+            approx_peak_width: float = 5,
+            buffer: int = 0,
+            merge_windows: bool = False,
+            param_bounds: Dict[str, list] = {},
+            integration_window: list[float] = [],
+            verbose: bool = True,
+            correct_baseline: bool = True,
+            max_iter: int = 1000000,
+            precision: int = 9,
+            peak_kwargs: Dict = {},
+            optimizer_kwargs: Dict = {},
+            n_jobs: int = 1,
+            executor=None,
+            fit_cache: helpers.FitCache | None = None,
+            model: str = "skewnorm",
+            engine: str = "curve_fit",
+            split_peaks: int | None = 10,
+            refine_iter: int = 100,
+            analytic_jac: bool = True,
+            time_budget: float | None = 10.0,
+            fallback: bool = True,
+    ) -> DataFrame:
+        """
+        Detect peak windows on the reference trace and fit every channel
+        within them. The windows of all channels are fitted together, serially
+        or across `n_jobs` worker processes.
+
+        Parameters
+        ----------
+        :param reference: `str`
+            Trace the peak windows are detected on, `"max"` for the maximum
+            over all channels at every time point (max-plot), or a channel name.
+        :param n_jobs: `int`
+            Number of worker processes the windows are fitted on. 1 fits
+            serially, -1 uses all cores.
+        :param executor: `concurrent.futures.Executor`, optional
+            Executor to fit the windows on instead of a new process pool.
+
+        The other parameters are as in `Chromatogram.fit_peaks`.
+
+        Returns
+        -------
+        areas : `pandas.core.frame.Dataframe`
+            Peak areas with one row per peak and one column per channel, see
+            `table`.
+        """
+        if model not in helpers.PEAK_MODELS or engine not in helpers.FIT_ENGINES:
+            raise ValueError(
+                f"Unknown peak model '{model}' or fit engine '{engine}'. Choose from "
+                f"{list(helpers.PEAK_MODELS)} and {list(helpers.FIT_ENGINES)}."
+            )
+        helpers._check_split_peaks(split_peaks)
+        if correct_baseline:
+            if self.corrected is None:
+                self.correct_baseline(window=approx_peak_width, precision=precision)
+            signals = self.corrected
+        else:
+            signals = self.signals
+
+        # Peak windows are detected once and shared by every channel
+        if reference == "max":
+            trace = signals.max(axis=1)
+        elif reference in self.channels:
+            trace = signals[:, self.channels.index(reference)]
+        else:
+            raise ValueError(f"Unknown reference '{reference}', give `\"max\"` or a channel name.")
+        ref = Chromatogram(
+            pd.DataFrame({self.time_col: self.time, "reference": trace}, copy=False),
+            cols={"time": self.time_col, "signal": "reference"},
+            dtype=trace.dtype,
+            copy=False,
+        )
+        ref._assign_windows(
+            tolerance=tolerance,
+            prominence=prominence,
+            rel_height=rel_height,
+            buffer=buffer,
+            peak_kwargs=peak_kwargs,
+            merge_windows=merge_windows,
+        )
+        self.reference = ref
+
+        # Peak ids follow the detected locations on the reference trace
+        keys = [
+            (k, i) for k, v in ref.window_props.items()
+            for i in range(v["num_peaks"])
+        ]
+        locations = [ref.window_props[k]["location"][i] for k, i in keys]
+        peak_ids = {key: n + 1 for n, key in enumerate(keys[j] for j in np.argsort(locations, kind="stable"))}
+
+        # Initial guesses of every channel from its own signal in the shared windows
+        jobs, tasks = [], []
+        for j in range(len(self.channels)):
+            chrom = self._channel(signals, j)
+            chrom._peak_indices = ref._peak_indices
+            chrom.windows = ref.windows
+            chrom.window_props = helpers.extract_window_props(chrom, ref.windows, ref._widths)
+
+            # Channels without signal at a peak still need a non-empty amplitude range
+            floor = 1e-6 * np.abs(signals[:, j]).max() or 1e-12
+            for v in chrom.window_props.values():
+                v["amplitude"] = np.where(np.abs(v["amplitude"]) < floor, floor, v["amplitude"])
+
+            chrom._model = model
+            windows, channel_tasks, matches = chrom._fit_tasks(
+                param_bounds, max_iter, analytic_jac, optimizer_kwargs, None, model, engine, split_peaks,
+                time_budget, fallback,
+            )
+            jobs.append((chrom, windows, matches, len(channel_tasks)))
+            tasks.extend(channel_tasks)
+
+        with helpers.shared_executor(n_jobs, executor) as pool:
+            progress = helpers.progress_bar(total=len(tasks), desc="Deconvolving channels") if verbose else None
+            try:
+                results = helpers.fit_windows(
+                    tasks,
+                    n_jobs=n_jobs,
+                    executor=pool,
+                    callback=progress.update if progress is not None else None,
+                    cache=fit_cache,
+                )
+            finally:
+                if progress is not None:
+                    progress.close()
+
+            # Seams of split windows, refined for all channels at once in every round
+            joins, pos = [], 0
+            for chrom, windows, matches, n_tasks in jobs:
+                joins.append(chrom._join_subs(windows, results[pos:pos + n_tasks], matches))
+                pos += n_tasks
+            for parity in (0, 1):
+                seam_jobs, seam_tasks = [], []
+                for (chrom, *_), joined in zip(jobs, joins):
+                    seams, channel_tasks = chrom._seam_tasks(
+                        joined, parity, refine_iter, analytic_jac, optimizer_kwargs, model, time_budget, fallback
+                    )
+                    seam_jobs.append((chrom, joined, seams))
+                    seam_tasks.extend(channel_tasks)
+                if not seam_tasks:
+                    continue
+                refined = helpers.fit_windows(seam_tasks, n_jobs=n_jobs, executor=pool, cache=fit_cache)
+                pos = 0
+                for chrom, joined, seams in seam_jobs:
+                    chrom._apply_seams(joined, seams, refined[pos:pos + len(seams)])
+                    pos += len(seams)
+
+        grid = (self.time, integration_window, self._timestep)
+        rows = []
+        self.channel_chromatograms = {}
+        for name, (chrom, *_), joined in zip(self.channels, jobs, joins):
+            windows, channel_results, _ = chrom._joined(joined)
+            chrom._peak_props = chrom._collect_fits(windows, channel_results, grid)
+            self.channel_chromatograms[name] = chrom
+            for k, window in chrom._peak_props.items():
+                for i, p in enumerate(window.values()):
+                    rows.append({
+                        "channel": name,
+                        "peak_id": peak_ids[(k, i)],
+                        "retention_time": p["retention_time"],
+                        "scale": p["scale"],
+                        "skew": p["alpha"],
+                        "amplitude": p["amplitude"],
+                        "area": p["area"],
+                        "signal_maximum": p["signal_max"],
+                        "status": p["status"],
+                    })
+
+        columns = ["channel", "peak_id", "retention_time", "scale", "skew", "amplitude", "area", "signal_maximum", "status"]
+        self.peaks = pd.DataFrame(rows, columns=columns).sort_values(by="peak_id", kind="stable").reset_index(drop=True)
+        return self.table("area")
+
+    def table(self, value: str = "area") -> DataFrame:
+        """Peak x channel table of `value`, one row per `peak_id` and one column per channel."""
+        if self.peaks is None:
+            raise RuntimeError("Run `fit_peaks()` first.")
+        return self.peaks.pivot(index="peak_id", columns="channel", values=value).reindex(columns=self.channels)
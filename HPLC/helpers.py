@@ -1,19 +1,33 @@
 # Modular helper functions like compute_skewnorm
 from typing import List, Dict, Tuple, Union
+from collections import OrderedDict
+from concurrent.futures import Executor, ProcessPoolExecutor, as_completed
+from contextlib import contextmanager
+import hashlib
+import os
+import time
 import numpy as np
 import pandas as pd
+import scipy.optimize
 import scipy.signal
+import scipy.special
 import warnings
 
-def normalize_signal(intensity: np.ndarray) -> np.ndarray:
+def normalize_signal(intensity: np.ndarray, vmin: float = None, vmax: float = None) -> np.ndarray:
+    vmin = intensity.min() if vmin is None else vmin
+    vmax = intensity.max() if vmax is None else vmax
     int_sign = np.sign(intensity)
-    norm = (intensity - intensity.min()) / (intensity.max() - intensity.min())
+    norm = (intensity - vmin) / (vmax - vmin)
     return int_sign * norm
 
 def _detect_peaks(signal: np.ndarray, prominence: float, peak_kwargs: Dict) -> np.ndarray:
     peaks, _ = scipy.signal.find_peaks(signal, prominence=prominence, **peak_kwargs)
     return peaks
 
+def _peak_prominences(signal: np.ndarray, peak_indices: np.ndarray, peak_kwargs: Dict) -> np.ndarray:
+    """Prominences of `peak_indices` as measured by `_detect_peaks`."""
+    return scipy.signal.peak_prominences(signal, peak_indices, wlen=peak_kwargs.get("wlen"))[0]
+
 def calculate_peak_widths(intensity: np.ndarray, peak_indices: np.ndarray, rel_height: float) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
     with warnings.catch_warnings():
         warnings.simplefilter("ignore", category=scipy.signal._peak_finding_utils.PeakPropertyWarning)
@@ -64,101 +78,1007 @@ def enforce_known_peaks(self, known_peaks: Union[List, Dict], tolerance: float,
     self._known_peaks = updated_known_peaks
     return _widths, _left, _right
 
-def build_peak_ranges(_left, _right, norm_int_len: int, buffer: int) -> List[np.ndarray]:
-    ranges = []
-    for l, r in zip(_left, _right):
-        rnge = np.arange(int(l - buffer), int(r + buffer))
-        rnge = rnge[(rnge >= 0) & (rnge < norm_int_len)]
-        ranges.append(rnge)
-    return ranges
+def _snip_loop(tform: np.ndarray, iterations) -> np.ndarray:
+    """Reference SNIP filter, one sample at a time."""
+    for i in iterations:
+        tform_new = tform.copy()
+        for j in range(i, len(tform) - i):
+            tform_new[j] = min(tform[j], 0.5 * (tform[j + i] + tform[j - i]))
+        tform = tform_new
+    return tform
+
+def _snip_vectorized(tform: np.ndarray, iterations) -> np.ndarray:
+    """
+    Whole-array SNIP filter. Each iteration takes the minimum of the signal
+    and the mean of its `i`-shifted neighbours in place, which gives the same
+    result as `_snip_loop` since every update only reads the previous iteration.
+    The filter runs along the first axis, so the columns of a 2D
+    (n_points, n_channels) array are all filtered at once.
+    """
+    tform = np.array(tform, dtype=float, order="K")
+    n = len(tform)
+    buf = np.empty_like(tform)
+    for i in iterations:
+        if 2 * i >= n:
+            break
+        avg = buf[:n - 2 * i]
+        np.add(tform[2 * i:], tform[:n - 2 * i], out=avg)
+        avg *= 0.5
+        np.minimum(tform[i:n - i], avg, out=tform[i:n - i])
+    return tform
+
+SNIP_ENGINES = {
+    "loop": _snip_loop,
+    "vectorized": _snip_vectorized,
+}
+
+def estimate_background(signal: np.ndarray, iterations, engine: str = "vectorized") -> np.ndarray:
+    """
+    SNIP background of a shifted, non-negative signal: LLS transform, SNIP
+    filter over `iterations`, then the inverse transform.
+    """
+    tform = np.log(np.log(np.sqrt(signal + 1) + 1) + 1)
+    tform = SNIP_ENGINES[engine](tform, iterations)
+    return (np.exp(np.exp(tform) - 1) - 1) ** 2 - 1
 
-def remove_subset_ranges(ranges: List[np.ndarray]) -> List[np.ndarray]:
-    valid = [True] * len(ranges)
-    for i, r1 in enumerate(ranges):
-        for j, r2 in enumerate(ranges):
-            if i != j and set(r2).issubset(r1):
-                valid[j] = False
-    return [r for i, r in enumerate(ranges) if valid[i]]
+class GrowableColumns:
+    """
+    Named numpy columns with amortized appends. Capacity doubles when full,
+    so appending `k` samples costs O(k) on average; `view` returns the
+    filled part without copying.
+    """
 
-def build_window_df(self, df: pd.DataFrame, ranges: List[np.ndarray]) -> pd.DataFrame:
-    df = df.copy()
-    df["time_idx"] = np.arange(len(df))
-    df["window_id"] = 0
-    df["window_type"] = "peak"
+    def __init__(self, columns: Dict[str, np.ndarray]) -> None:
+        self.n = len(next(iter(columns.values())))
+        capacity = max(2 * self.n, 16)
+        self._data = {}
+        for name, values in columns.items():
+            values = np.asarray(values)
+            self._data[name] = np.zeros(capacity, dtype=values.dtype)
+            self._data[name][:self.n] = values
 
-    for i, r in enumerate(ranges):
-        df.loc[df["time_idx"].isin(r), "window_id"] = i + 1
+    def append(self, n_new: int, **columns) -> None:
+        """Extend every column by `n_new` samples, filling those given in `columns`."""
+        needed = self.n + n_new
+        capacity = len(next(iter(self._data.values())))
+        if needed > capacity:
+            capacity = max(needed, 2 * capacity)
+            for name, arr in self._data.items():
+                grown = np.zeros(capacity, dtype=arr.dtype)
+                grown[:self.n] = arr[:self.n]
+                self._data[name] = grown
+        for name, values in columns.items():
+            self._data[name][self.n:needed] = values
+        self.n = needed
 
-    return df
+    def view(self, name: str) -> np.ndarray:
+        return self._data[name][:self.n]
 
-def assign_background_windows(window_df: pd.DataFrame) -> pd.DataFrame:
-    bg = window_df[window_df["window_id"] == 0]
-    tidx = bg["time_idx"].values
+def build_peak_ranges(_left, _right, norm_int_len: int, buffer: int) -> Tuple[np.ndarray, np.ndarray]:
+    """[start, stop) index spans of the peaks, widened by `buffer` and clipped to the signal."""
+    starts = np.trunc(np.asarray(_left, dtype=float) - buffer).astype(int)
+    stops = np.trunc(np.asarray(_right, dtype=float) + buffer).astype(int)
+    return np.clip(starts, 0, norm_int_len), np.clip(stops, 0, norm_int_len)
 
-    if not len(bg):
-        return window_df
+def remove_subset_ranges(starts: np.ndarray, stops: np.ndarray, merge: bool = False) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Drop empty spans and spans contained in another one, keeping the first of
+    identical spans and the original order. With `merge`, overlapping spans
+    are instead merged into their union, returned sorted by start.
+    """
+    starts, stops = np.asarray(starts, dtype=int), np.asarray(stops, dtype=int)
+    nonempty = stops > starts
+    starts, stops = starts[nonempty], stops[nonempty]
+    if not len(starts):
+        return starts, stops
 
-    diff = np.diff(tidx)
-    split_inds = np.where(diff > 1)[0]
+    # Sweep by start, longest first on ties, tracking the furthest stop so far
+    order = np.lexsort((-stops, starts))
+    s, e = starts[order], stops[order]
 
-    if len(split_inds) == 0:
-        window_df.loc[bg.index, ["window_id", "window_type"]] = [1, "interpeak"]
-        return window_df
+    if merge:
+        prev_max = np.maximum.accumulate(e)
+        new_group = np.ones(len(s), dtype=bool)
+        new_group[1:] = s[1:] >= prev_max[:-1]
+        group = np.cumsum(new_group) - 1
+        merged_stops = np.zeros(group[-1] + 1, dtype=int)
+        np.maximum.at(merged_stops, group, e)
+        return s[new_group], merged_stops
 
-    split_inds = np.insert(split_inds + 1, 0, 0)
-    split_inds = np.append(split_inds, len(tidx))
+    prev_max = np.concatenate(([-1], np.maximum.accumulate(e)[:-1]))
+    keep = np.zeros(len(starts), dtype=bool)
+    keep[order] = e > prev_max
+    return starts[keep], stops[keep]
+
+class WindowIndex:
+    """
+    Per-sample window labels of a chromatogram. `window_id` holds the window
+    each sample belongs to (0 if unassigned) and `is_peak` whether that
+    window is a peak or an interpeak window, mirroring the `window_id` and
+    `window_type` columns of `window_df`.
+    """
+
+    def __init__(self, window_id: np.ndarray, is_peak: np.ndarray) -> None:
+        self.window_id = window_id
+        self.is_peak = is_peak
+
+    @property
+    def time_idx(self) -> np.ndarray:
+        """Indices of the samples assigned to a window."""
+        return np.flatnonzero(self.window_id > 0)
+
+    @property
+    def window_type(self) -> np.ndarray:
+        return np.where(self.is_peak, "peak", "interpeak")
+
+    def peak_spans(self) -> Dict[int, Tuple[int, int]]:
+        """[start, stop) index span of every peak window, keyed by window id."""
+        idx = np.flatnonzero(self.is_peak & (self.window_id > 0))
+        if not len(idx):
+            return {}
+        ids = self.window_id[idx]
+        n_ids = ids.max() + 1
+        starts = np.full(n_ids, len(self.window_id))
+        stops = np.zeros(n_ids, dtype=int)
+        np.minimum.at(starts, ids, idx)
+        np.maximum.at(stops, ids, idx + 1)
+        return {int(i): (int(starts[i]), int(stops[i])) for i in np.unique(ids)}
+
+    def to_frame(self, df: pd.DataFrame) -> pd.DataFrame:
+        """The rows of `df` assigned to a window, with the window columns added."""
+        time_idx = self.time_idx
+        return df.iloc[time_idx].assign(
+            time_idx=time_idx,
+            window_id=self.window_id[time_idx],
+            window_type=self.window_type[time_idx],
+        )
+
+def build_window_index(starts: np.ndarray, stops: np.ndarray, n_points: int, min_interpeak: int = 10) -> WindowIndex:
+    """
+    Label peak windows from their [start, stop) index spans, later spans
+    taking precedence where they overlap, then split the remaining samples
+    into interpeak windows. Interpeak segments shorter than `min_interpeak`
+    are left unassigned, unless the background is one single segment.
+    """
+    window_id = np.zeros(n_points, dtype=int)
+    for i, (start, stop) in enumerate(zip(starts, stops)):
+        window_id[start:stop] = i + 1
+    is_peak = np.ones(n_points, dtype=bool)
 
-    for i, (start, end) in enumerate(zip(split_inds[:-1], split_inds[1:])):
-        segment = tidx[start:end]
-        if len(segment) >= 10:
-            window_df.loc[window_df["time_idx"].isin(segment), "window_id"] = i + 1
-            window_df.loc[window_df["time_idx"].isin(segment), "window_type"] = "interpeak"
+    background = window_id == 0
+    if not background.any():
+        return WindowIndex(window_id, is_peak)
 
-    return window_df[window_df["window_id"] > 0]
+    # Contiguous runs of unassigned samples
+    edges = np.diff(np.concatenate(([0], background.view(np.int8), [0])))
+    seg_starts = np.flatnonzero(edges == 1)
+    seg_stops = np.flatnonzero(edges == -1)
+
+    if len(seg_starts) == 1:
+        window_id[background] = 1
+        is_peak[background] = False
+        return WindowIndex(window_id, is_peak)
+
+    for i, (start, stop) in enumerate(zip(seg_starts, seg_stops)):
+        if stop - start >= min_interpeak:
+            window_id[start:stop] = i + 1
+            is_peak[start:stop] = False
+
+    return WindowIndex(window_id, is_peak)
+
+def extract_window_props(self, windows: WindowIndex, _widths) -> Dict:
+    """
+    Properties of every peak window. Peaks are assigned to the window span
+    containing them with `np.searchsorted`, and the window time and signal
+    are slices of the chromatogram arrays rather than copies.
+    """
+    time = self._arrays[self.time_col]
+    signal = self._arrays[self.signal_col]
+    spans = windows.peak_spans()
+
+    window_ids = np.fromiter(spans.keys(), dtype=int, count=len(spans))
+    starts = np.array([s for s, _ in spans.values()], dtype=int)
+    stops = np.array([e for _, e in spans.values()], dtype=int)
+    by_start = np.argsort(starts)
+
+    # Window of each peak, -1 for peaks outside of all peak windows
+    peaks = np.asarray(self._peak_indices, dtype=int)
+    pos = np.searchsorted(starts[by_start], peaks, side="right") - 1
+    owner = np.full(len(peaks), -1)
+    inside = pos >= 0
+    candidate = by_start[pos[inside]]
+    contained = peaks[inside] < stops[candidate]
+    owner[np.flatnonzero(inside)[contained]] = candidate[contained]
+
+    # Gather peak properties once, grouped by window in detection order
+    order = np.argsort(owner, kind="stable")
+    order = order[owner[order] >= 0]
+    bounds = np.searchsorted(owner[order], np.arange(len(window_ids) + 1))
+    amplitude = signal[peaks[order]]
+    location = np.round(time[peaks[order]], self._timestep_precision)
+    width = np.asarray(_widths)[order] * self._timestep
 
-def extract_window_props(self, window_df: pd.DataFrame, _widths) -> Dict:
     window_dict = {}
-    for gid, group in window_df[window_df["window_type"] == "peak"].groupby("window_id"):
-        peak_idxs = [i for i in self._peak_indices if i in group["time_idx"].values]
-        peak_inds = [np.where(self._peak_indices == i)[0][0] for i in peak_idxs]
-        window_dict[gid] = {
-            "time_range": group[self.time_col].values,
-            "signal": group[self.signal_col].values,
-            "signal_area": group[self.signal_col].sum(),
-            "num_peaks": len(peak_idxs),
-            "amplitude": [group[group["time_idx"] == p][self.signal_col].iloc[0] for p in peak_idxs],
-            "location": [np.round(group[group["time_idx"] == p][self.time_col].iloc[0], self._timestep_precision) for p in peak_idxs],
-            "width": [_widths[i] * self._timestep for i in peak_inds],
+    for w, gid in enumerate(window_ids):
+        start, stop = starts[w], stops[w]
+        lo, hi = bounds[w], bounds[w + 1]
+        window_dict[int(gid)] = {
+            "time_range": time[start:stop],
+            "signal": signal[start:stop],
+            "signal_area": signal[start:stop].sum(),
+            "num_peaks": hi - lo,
+            "amplitude": amplitude[lo:hi],
+            "location": location[lo:hi],
+            "width": width[lo:hi],
         }
     return window_dict
 
 
+def _check_split_peaks(split_peaks) -> None:
+    """Reject a `split_peaks` that cannot leave sub-windows with fewer peaks."""
+    if split_peaks is not None and split_peaks < 2:
+        raise ValueError(
+            f"`split_peaks` must be at least 2 (sub-windows hold fewer peaks than it) or None, got {split_peaks}."
+        )
+
+
+def _split_budget(time_budget, n_subs: int):
+    """
+    Time budget of each sub-window fit and seam refit of a window split
+    into `n_subs` sub-windows, which together share the `time_budget` of
+    the window. None stays without time limit.
+    """
+    return None if time_budget is None else time_budget / (2 * n_subs - 1)
+
+
+def split_window(window: Dict, max_peaks: int) -> List[Dict]:
+    """
+    Split the properties of a window with `max_peaks` or more peaks into
+    sub-windows with fewer peaks. Groups are split recursively at the
+    weakest overlap between adjacent peaks, the lowest signal minimum
+    between them relative to the smaller peak. Sub-windows share their
+    boundary sample, have the keys of `extract_window_props` and `peaks`,
+    the indices of their peaks in the window, ordered by location.
+    """
+    _check_split_peaks(max_peaks)
+    time, signal = window["time_range"], window["signal"]
+    order = np.argsort(window["location"], kind="stable")
+    amplitude = np.asarray(window["amplitude"])[order]
+    polarity = 1 if amplitude.sum() >= 0 else -1
+    positions = np.clip(np.searchsorted(time, np.asarray(window["location"])[order]), 0, len(time) - 1)
+
+    # Deepest point between every pair of adjacent peaks and how weakly they overlap there
+    seams = np.array([
+        lo + np.argmin(polarity * signal[lo:hi + 1])
+        for lo, hi in zip(positions[:-1], positions[1:])
+    ], dtype=int)
+    heights = np.minimum(polarity * amplitude[:-1], polarity * amplitude[1:])
+    overlap = polarity * signal[seams] / np.where(heights > 0, heights, np.inf)
+
+    groups = [(0, len(order))]
+    while any(hi - lo >= max_peaks for lo, hi in groups):
+        lo, hi = next(g for g in groups if g[1] - g[0] >= max_peaks)
+        cut = lo + np.argmin(overlap[lo:hi - 1]) + 1
+        i = groups.index((lo, hi))
+        groups[i:i + 1] = [(lo, cut), (cut, hi)]
+
+    subs = []
+    for lo, hi in groups:
+        start = seams[lo - 1] if lo > 0 else 0
+        stop = seams[hi - 1] + 1 if hi < len(order) else len(time)
+        peaks = order[lo:hi]
+        subs.append({
+            "time_range": time[start:stop],
+            "signal": signal[start:stop],
+            "signal_area": signal[start:stop].sum(),
+            "num_peaks": hi - lo,
+            "amplitude": np.asarray(window["amplitude"])[peaks],
+            "location": np.asarray(window["location"])[peaks],
+            "width": np.asarray(window["width"])[peaks],
+            "peaks": peaks,
+        })
+    return subs
+
 def _compute_skewnorm(x, amplitude, loc, scale, alpha):
     _x = alpha * (x - loc) / scale
     norm = (1 / np.sqrt(2 * np.pi * scale**2)) * np.exp(-((x - loc) ** 2) / (2 * scale**2))
     cdf = 0.5 * (1 + scipy.special.erf(_x / np.sqrt(2)))
     return amplitude * 2 * norm * cdf
 
-def _sum_skewnorms(x, *params):
+class UnmixedPeaks:
+    """
+    Compact matrix of reconstructed peaks, shape (n_points, n_peaks). Each
+    peak is only stored over the index span where it is non-negligible.
+    Indexing as `[:, i]` and `sum(axis=1)` behave like the dense matrix,
+    `toarray()` builds it in full.
+    """
+
+    def __init__(self, n_points: int) -> None:
+        self.n_points = n_points
+        self.starts = []
+        self.values = []
+
+    @classmethod
+    def from_params(cls, x, params, precision: int = 9, model: str = "skewnorm") -> "UnmixedPeaks":
+        """Evaluate the peaks `params` of `PEAK_MODELS[model]` on `x`, rounded to `precision`."""
+        peak_model = PEAK_MODELS[model]
+        out = cls(len(x))
+        threshold = 0.5 * 10.0 ** -precision
+        for p in params:
+            start, stop = peak_model.support(x, *p, threshold)
+            values = np.round(peak_model.evaluate(x[start:stop], *p), decimals=precision)
+            nonzero = np.flatnonzero(values)
+            if len(nonzero):
+                values = values[nonzero[0]:nonzero[-1] + 1]
+                start += nonzero[0]
+            else:
+                values = values[:0]
+            out.append(start, values)
+        return out
+
+    def append(self, start: int, values: np.ndarray) -> None:
+        self.starts.append(int(start))
+        self.values.append(values)
+
+    @property
+    def shape(self) -> Tuple[int, int]:
+        return self.n_points, len(self.values)
+
+    @property
+    def nbytes(self) -> int:
+        return sum(v.nbytes for v in self.values)
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def support(self, i: int) -> Tuple[slice, np.ndarray]:
+        """Index slice and values of peak `i` over its support."""
+        start = self.starts[i]
+        return slice(start, start + len(self.values[i])), self.values[i]
+
+    def column(self, i: int) -> np.ndarray:
+        """Peak `i` over the full time axis, negative `i` counting from the last peak."""
+        if not -len(self) <= i < len(self):
+            raise IndexError(f"Peak index {i} is out of bounds for {len(self)} peak(s).")
+        i %= len(self)
+        out = np.zeros(self.n_points)
+        span, values = self.support(i)
+        out[span] = values
+        return out
+
+    def sum(self, axis: int = 1, dtype=None, out=None, **kwargs) -> np.ndarray:
+        """
+        Sum over the peaks, also reached by `np.sum(unmixed, axis=1)`. Other
+        axes are summed over the dense matrix.
+        """
+        if axis not in (1, -1):
+            return np.sum(self.toarray(), axis=axis, dtype=dtype, out=out, **kwargs)
+        total = np.zeros(self.n_points)
+        for i in range(len(self)):
+            span, values = self.support(i)
+            total[span] += values
+        if dtype is not None:
+            total = total.astype(dtype)
+        if out is not None:
+            out[...] = total
+            return out
+        return total
+
+    def toarray(self) -> np.ndarray:
+        out = np.zeros(self.shape)
+        for i in range(len(self)):
+            span, values = self.support(i)
+            out[span, i] = values
+        return out
+
+    def __array__(self, dtype=None, copy=None):
+        out = self.toarray()
+        return out if dtype is None else out.astype(dtype)
+
+    def __getitem__(self, key):
+        if isinstance(key, tuple) and len(key) == 2 and key[0] == slice(None) and isinstance(key[1], (int, np.integer)):
+            return self.column(int(key[1]))
+        return self.toarray()[key]
+
+
+def _skewnorm_terms(x, params):
+    """
+    Shared terms of the skew-normal peaks in `params`, evaluated for all
+    peaks at once. Returns the standardized distance `z`, the normal pdf
+    `phi(z)`, the skew cdf `Phi(alpha * z)` and the parameters as columns.
+    """
+    amplitude, loc, scale, alpha = np.reshape(np.asarray(params, dtype=float), (-1, 4)).T[:, :, None]
+    z = (np.asarray(x, dtype=float)[None, :] - loc) / scale
+    pdf = np.exp(-0.5 * z**2) / np.sqrt(2 * np.pi)
+    cdf = 0.5 * (1 + scipy.special.erf(alpha * z / np.sqrt(2)))
+    return z, pdf, cdf, amplitude, scale, alpha
+
+def _skewnorm_matrix(x, *params):
+    """
+    Skew-normal peaks as one (n_peaks, n_points) array, same formula as
+    `_compute_skewnorm`.
+    """
+    _, pdf, cdf, amplitude, scale, _ = _skewnorm_terms(x, params)
+    return 2 * amplitude / scale * pdf * cdf
+
+def _sum_skewnorms_jac(x, *params):
+    """
+    Analytic Jacobian of the sum of `_skewnorm_matrix` peaks, the model of
+    `PEAK_MODELS["skewnorm"]`, with respect to `params`, shaped
+    (n_points, 4 * n_peaks) as expected by `scipy.optimize.curve_fit`.
+    """
+    z, pdf, cdf, amplitude, scale, alpha = _skewnorm_terms(x, params)
+    skew_pdf = np.exp(-0.5 * (alpha * z) ** 2) / np.sqrt(2 * np.pi)
+
+    d_amplitude = 2 / scale * pdf * cdf
+    y = amplitude * d_amplitude
+    # d/dz of pdf(z) * cdf(alpha z), scaled by the peak prefactor
+    dy_dz = 2 * amplitude / scale * pdf * (alpha * skew_pdf - z * cdf)
+    d_loc = -dy_dz / scale
+    d_scale = -(y + z * dy_dz) / scale
+    d_alpha = 2 * amplitude / scale * pdf * skew_pdf * z
+
+    jac = np.stack([d_amplitude, d_loc, d_scale, d_alpha], axis=1)
+    return jac.reshape(-1, jac.shape[-1]).T
+
+
+def _gaussian_matrix(x, *params):
+    """
+    Gaussian peaks as one (n_peaks, n_points) array. The skew of `params`
+    is ignored, the peaks equal skew-normal peaks with zero skew.
+    """
+    amplitude, loc, scale, _ = np.reshape(np.asarray(params, dtype=float), (-1, 4)).T[:, :, None]
+    z = (np.asarray(x, dtype=float)[None, :] - loc) / scale
+    return amplitude / scale * np.exp(-0.5 * z**2) / np.sqrt(2 * np.pi)
+
+def _gaussian_jac(x, *params):
+    """Analytic Jacobian of the sum of `_gaussian_matrix`, shaped (n_points, 4 * n_peaks)."""
+    amplitude, loc, scale, _ = np.reshape(np.asarray(params, dtype=float), (-1, 4)).T[:, :, None]
+    z = (np.asarray(x, dtype=float)[None, :] - loc) / scale
+    d_amplitude = np.exp(-0.5 * z**2) / (np.sqrt(2 * np.pi) * scale)
+    y = amplitude * d_amplitude
+    jac = np.stack([d_amplitude, y * z / scale, y * (z**2 - 1) / scale, np.zeros_like(y)], axis=1)
+    return jac.reshape(-1, jac.shape[-1]).T
+
+def _emg_matrix(x, *params):
+    """
+    Exponentially modified Gaussian peaks as one (n_peaks, n_points) array.
+    The skew is the time constant of the exponential relative to the scale,
+    negative for fronting peaks. Evaluated through `erfcx` where the plain
+    formula would overflow.
+    """
+    amplitude, loc, scale, skew = np.reshape(np.asarray(params, dtype=float), (-1, 4)).T[:, :, None]
+    z = (np.asarray(x, dtype=float)[None, :] - loc) / scale
+    z = np.where(skew < 0, -z, z)
+    k = np.maximum(np.abs(skew), 1e-8)
+    u = (1 / k - z) / np.sqrt(2)
+    with np.errstate(over="ignore", under="ignore", invalid="ignore"):
+        shape = np.where(
+            u >= 0,
+            np.exp(-0.5 * z**2) * scipy.special.erfcx(u),
+            np.exp(0.5 / k**2 - z / k) * scipy.special.erfc(u),
+        )
+    return amplitude / (2 * k * scale) * shape
+
+def _gaussian_extent(scale, skew, ratio) -> Tuple[float, float]:
+    """Distances left and right of the location beyond which a Gaussian-bounded peak is below 1 / `ratio` of its height bound."""
+    half_width = scale * np.sqrt(2 * np.log(ratio))
+    return half_width, half_width
+
+def _emg_extent(scale, skew, ratio) -> Tuple[float, float]:
+    """As `_gaussian_extent`, with the exponential tail added on the side of the skew."""
+    k = max(abs(skew), 1e-8)
+    half_width = scale * np.sqrt(2 * np.log(2 * ratio))
+    tail = k * scale * (np.log(2 * ratio) + np.log1p(1 / (k * np.sqrt(2 * np.pi))))
+    return (half_width + tail, half_width) if skew < 0 else (half_width, half_width + tail)
+
+class PeakModel:
+    """
+    Peak shape fitted by `_fit_window`. Every peak has the parameters
+    (amplitude, location, scale, skew), the amplitude being its area, so
+    models share the peak tables and bounds. Models that are not `skewed`
+    keep the skew at its initial value.
+    """
+
+    def __init__(self, name: str, matrix, jac=None, skewed: bool = True, extent=_gaussian_extent, single=None) -> None:
+        self.name = name
+        self.matrix = matrix
+        self.jac = jac
+        self.skewed = skewed
+        self.extent = extent
+        self._single = single
+
+    def evaluate(self, x, amplitude, loc, scale, skew) -> np.ndarray:
+        """One peak on `x`."""
+        if self._single is not None:
+            return self._single(x, amplitude, loc, scale, skew)
+        return self.matrix(x, amplitude, loc, scale, skew)[0]
+
+    def sum(self, x, *params) -> np.ndarray:
+        """Sum of the peaks `params`, the model function of `curve_fit`."""
+        return self.matrix(x, *params).sum(axis=0)
+
+    def height_bound(self, amplitude, scale) -> float:
+        # Every model is bounded by twice the Gaussian of the same area
+        return 2 * np.abs(amplitude) / (scale * np.sqrt(2 * np.pi))
+
+    def support(self, x, amplitude, loc, scale, skew, threshold) -> Tuple[int, int]:
+        """
+        Index span [start, stop) of the sorted `x` outside of which the peak
+        stays below `threshold`.
+        """
+        peak_max = self.height_bound(amplitude, scale)
+        if peak_max <= threshold:
+            return 0, 0
+        left, right = self.extent(scale, skew, peak_max / threshold)
+        start = np.searchsorted(x, loc - left, side="left")
+        stop = np.searchsorted(x, loc + right, side="right")
+        return int(start), int(stop)
+
+PEAK_MODELS = {
+    "skewnorm": PeakModel("skewnorm", _skewnorm_matrix, _sum_skewnorms_jac, single=_compute_skewnorm),
+    "gaussian": PeakModel("gaussian", _gaussian_matrix, _gaussian_jac, skewed=False),
+    "emg": PeakModel("emg", _emg_matrix, extent=_emg_extent),
+}
+
+FIT_ENGINES = ("curve_fit", "varpro")
+
+FIT_STATUSES = ("fitted", "relaxed", "simplified", "integrated")
+
+class FitBudgetExceeded(RuntimeError):
+    """Raised inside a window fit when its wall-clock budget runs out."""
+
+def _fit_window(time_range, signal, p0, bounds, max_iter, analytic_jac, optimizer_kwargs,
+                model: str = "skewnorm", engine: str = "curve_fit", time_budget: float = None,
+                fallback: bool = False) -> Tuple[np.ndarray, Dict]:
+    """
+    Fit one window with a sum of `PEAK_MODELS[model]` peaks, by `curve_fit`
+    over all parameters or by variable projection (`engine="varpro"`, see
+    `_fit_varpro`). Returns the flat optimal parameters and a dict of fit
+    information: `nfev` (number of model evaluations), `seconds`, whether
+    the optimizer `converged` and the `status` of the fit, see
+    `_fit_escalating`.
+
+    With a `time_budget` in seconds the fit raises `FitBudgetExceeded` once
+    it runs out, unless `fallback` escalates it instead.
+    """
+    start = time.perf_counter()
+    if engine not in FIT_ENGINES:
+        raise ValueError(f"Unknown fit engine '{engine}'. Choose from {list(FIT_ENGINES)}.")
+    if time_budget is None and not fallback:
+        popt, nfev, converged = _fit_attempt(time_range, signal, p0, bounds, max_iter, analytic_jac, optimizer_kwargs, PEAK_MODELS[model], engine)
+        status = "fitted"
+    else:
+        popt, nfev, converged, status = _fit_escalating(
+            time_range, signal, p0, bounds, max_iter, analytic_jac, optimizer_kwargs, model, engine, start, time_budget, fallback
+        )
+    return popt, {
+        "nfev": nfev,
+        "seconds": time.perf_counter() - start,
+        "converged": converged,
+        "status": status,
+    }
+
+def _fit_attempt(time_range, signal, p0, bounds, max_iter, analytic_jac, optimizer_kwargs, peak_model, engine):
+    if engine == "varpro":
+        return _fit_varpro(time_range, signal, p0, bounds, max_iter, analytic_jac, peak_model, optimizer_kwargs)
+    return _fit_curve_fit(time_range, signal, p0, bounds, max_iter, analytic_jac, peak_model, optimizer_kwargs)
+
+def _fit_escalating(time_range, signal, p0, bounds, max_iter, analytic_jac, optimizer_kwargs, model, engine,
+                    start, time_budget, fallback):
     """
-    Sum of skew-normal distributions for curve fitting.
-    Each peak is represented by 4 parameters: amplitude, center, width, skew.
+    Escalation ladder of a window fit started at `start`. Every step is
+    capped at `max_iter` evaluations and must converge to finite parameters
+    before a deadline, or the next step is tried:
+
+    1. `"fitted"`, the requested fit, within half of the `time_budget`,
+    2. `"relaxed"`, by variable projection within `_relax_bounds`,
+    3. `"simplified"`, Gaussian peaks (zero skew) within the relaxed bounds,
+    4. `"integrated"`, drop-line integration of the raw signal, see
+       `_integrate_window`, which takes no optimizer time.
+
+    Steps 2 and 3 share the rest of the budget. Without `fallback` only
+    step 1 is run, and its errors are raised.
+    """
+    p0 = np.asarray(p0, dtype=float)
+    stages = [("fitted", model, engine, bounds)]
+    if fallback:
+        relaxed = _relax_bounds(time_range, p0, bounds)
+        stages.append(("relaxed", model, "varpro", relaxed))
+        if model != "gaussian":
+            stages.append(("simplified", "gaussian", "varpro", relaxed))
+    shares = [1.0] if len(stages) == 1 else 0.5 + 0.5 * np.arange(len(stages)) / (len(stages) - 1)
+
+    nfev = 0
+    for (status, name, stage_engine, stage_bounds), share in zip(stages, shares):
+        counter = [0]
+        deadline = None if time_budget is None else start + share * time_budget
+        x0 = np.clip(p0, stage_bounds[0], stage_bounds[1])
+        if name != model:
+            x0[3::4] = 0
+        try:
+            popt, n, converged = _fit_attempt(
+                time_range, signal, x0, stage_bounds, max_iter, analytic_jac, optimizer_kwargs,
+                _budgeted(PEAK_MODELS[name], deadline, counter), stage_engine,
+            )
+        except (RuntimeError, ValueError, np.linalg.LinAlgError):
+            if not fallback:
+                raise
+            nfev += counter[0]
+            continue
+        nfev += n
+        if not fallback or (converged and np.isfinite(popt).all()):
+            return popt, nfev, converged, status
+
+    popt, _, _ = _integrate_window(time_range, signal, p0[1::4])
+    return popt, nfev, False, "integrated"
+
+def _budgeted(model: PeakModel, deadline: float, counter: list) -> PeakModel:
+    """
+    `model` raising `FitBudgetExceeded` once `time.perf_counter()` passes
+    `deadline` (None for no deadline), and counting its evaluations in
+    `counter[0]`. Both engines only evaluate the model through its matrix
+    and Jacobian, so a fit stops within one evaluation of the deadline.
+    """
+    def _wrap(func, count):
+        if func is None:
+            return None
+
+        def wrapper(x, *params):
+            if deadline is not None and time.perf_counter() > deadline:
+                raise FitBudgetExceeded(f"{model.name} fit ran out of its time budget.")
+            counter[0] += count
+            return func(x, *params)
+        return wrapper
+
+    return PeakModel(model.name, _wrap(model.matrix, 1), _wrap(model.jac, 0), model.skewed, model.extent)
+
+def _relax_bounds(time_range, p0, bounds) -> Tuple[np.ndarray, np.ndarray]:
     """
-    from scipy.stats import skewnorm
-    n_params_per_peak = 4
-    n_peaks = len(params) // n_params_per_peak
-    y = np.zeros_like(x)
+    Bounds of the relaxed refit: amplitudes only keep the sign of their
+    initial guess, locations span at least the window, scales reach up to
+    its length and skews are free.
+    """
+    lower, upper = np.array(bounds[0], dtype=float), np.array(bounds[1], dtype=float)
+    positive = np.asarray(p0, dtype=float)[0::4] >= 0
+    lower[0::4] = np.where(positive, 0, -np.inf)
+    upper[0::4] = np.where(positive, np.inf, 0)
+    lower[1::4] = np.minimum(lower[1::4], np.min(time_range))
+    upper[1::4] = np.maximum(upper[1::4], np.max(time_range))
+    upper[2::4] = np.maximum(upper[2::4], np.ptp(time_range))
+    lower[3::4], upper[3::4] = -np.inf, np.inf
+    return lower, upper
+
+def _integrate_window(time_range, signal, locations) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Drop-line integration of the raw signal of a window, the last step of
+    `_fit_escalating`. The window is cut at the lowest point between every
+    two adjacent peak `locations`, and each segment is summed like
+    `_peak_area_max` sums a fitted peak. Returns Gaussian parameters with
+    the area, centroid and spread of every segment, which stand in for the
+    peaks in reconstructions, and the segment sums and maxima.
+    """
+    x = np.asarray(time_range, dtype=float)
+    y = np.asarray(signal, dtype=float)
+    idx = np.clip(np.searchsorted(x, locations), 0, len(x) - 1)
+    order = np.argsort(idx, kind="stable")
+    cuts = [0]
+    for a, b in zip(idx[order][:-1], idx[order][1:]):
+        cuts.append(a + int(np.argmin(y[a:b + 1])) if b > a else a)
+    cuts.append(len(x))
+    timestep = np.mean(np.diff(x)) if len(x) > 1 else 1.0
+
+    params = np.zeros((len(idx), 4))
+    areas, maxima = np.zeros(len(idx)), np.zeros(len(idx))
+    for rank, i in enumerate(order):
+        xs, ys = x[cuts[rank]:cuts[rank + 1]], y[cuts[rank]:cuts[rank + 1]]
+        weights = np.clip(ys, 0, None)
+        loc, scale = locations[i], 0.0
+        if weights.sum() > 0:
+            loc = weights @ xs / weights.sum()
+            scale = np.sqrt(weights @ (xs - loc) ** 2 / weights.sum())
+        if len(ys):
+            areas[i], maxima[i] = ys.sum(), ys.max()
+        params[i] = [areas[i] * timestep, loc, max(scale, timestep), 0]
+    return params.ravel(), areas, maxima
+
+def _free_mask(model: PeakModel, n_peaks: int) -> np.ndarray:
+    """Which of the 4 * n_peaks parameters `model` fits."""
+    return np.tile([True, True, True, model.skewed], n_peaks)
+
+def _fit_curve_fit(time_range, signal, p0, bounds, max_iter, analytic_jac, model, optimizer_kwargs):
+    """All free parameters by `scipy.optimize.curve_fit`."""
+    jac = model.jac if analytic_jac else None
+    free = _free_mask(model, len(p0) // 4)
+    if free.all():
+        func = model.sum
+        x0, lower, upper = p0, bounds[0], bounds[1]
+    else:
+        # Fixed parameters are held at their initial values
+        full = np.asarray(p0, dtype=float)
+
+        def _expand(params):
+            out = full.copy()
+            out[free] = params
+            return out
+
+        func = lambda x, *params: model.sum(x, *_expand(params))
+        if jac is not None:
+            model_jac = jac
+            jac = lambda x, *params: model_jac(x, *_expand(params))[:, free]
+        x0 = full[free]
+        lower, upper = np.asarray(bounds[0], dtype=float)[free], np.asarray(bounds[1], dtype=float)[free]
+
+    popt, _, infodict, _, ier = scipy.optimize.curve_fit(
+        func,
+        time_range,
+        signal,
+        p0=x0,
+        bounds=(lower, upper),
+        maxfev=max_iter,
+        jac=jac,
+        full_output=True,
+        **optimizer_kwargs
+    )
+    if not free.all():
+        popt = _expand(popt)
+    return popt, int(infodict["nfev"]), ier in (1, 2, 3, 4)
+
+def _fit_varpro(time_range, signal, p0, bounds, max_iter, analytic_jac, model, optimizer_kwargs):
+    """
+    Variable projection: the amplitudes enter the model linearly, so for
+    every trial of the location, scale and skew they are solved by bounded
+    linear least squares (within the amplitude bounds, which keep their
+    sign), and only the remaining parameters are optimized nonlinearly with
+    `scipy.optimize.least_squares`. With `analytic_jac` and a model Jacobian
+    the Jacobian is Kaufman's approximation: the model derivatives at the
+    solved amplitudes, projected off the span of the unconstrained peaks.
+    """
+    x = np.asarray(time_range, dtype=float)
+    y = np.asarray(signal, dtype=float)
+    full = np.asarray(p0, dtype=float).copy()
+    lower, upper = np.asarray(bounds[0], dtype=float), np.asarray(bounds[1], dtype=float)
+    nonlinear = _free_mask(model, len(full) // 4)
+    nonlinear[0::4] = False
+    amp_bounds = (lower[0::4], upper[0::4])
+    last = {}
+
+    def _solve(theta):
+        if last.get("theta") is not None and np.array_equal(last["theta"], theta):
+            return last["basis"], last["amplitudes"]
+        full[nonlinear] = theta
+        full[0::4] = 1
+        basis = model.matrix(x, *full)
+        amplitudes = scipy.optimize.lsq_linear(basis.T, y, bounds=amp_bounds, method="bvls").x
+        last.update(theta=np.array(theta), basis=basis, amplitudes=amplitudes)
+        return basis, amplitudes
+
+    def _residuals(theta):
+        basis, amplitudes = _solve(theta)
+        return amplitudes @ basis - y
+
+    def _jac(theta):
+        basis, amplitudes = _solve(theta)
+        params = full.copy()
+        params[nonlinear] = theta
+        params[0::4] = amplitudes
+        jac = model.jac(x, *params)[:, nonlinear]
+        unconstrained = (amplitudes > amp_bounds[0]) & (amplitudes < amp_bounds[1])
+        if unconstrained.any():
+            q, _ = np.linalg.qr(basis[unconstrained].T)
+            jac -= q @ (q.T @ jac)
+        return jac
+
+    result = scipy.optimize.least_squares(
+        _residuals,
+        full[nonlinear],
+        jac=_jac if analytic_jac and model.jac is not None else "2-point",
+        bounds=(lower[nonlinear], upper[nonlinear]),
+        max_nfev=max_iter,
+        **optimizer_kwargs
+    )
+    _, amplitudes = _solve(result.x)
+    full[nonlinear] = result.x
+    full[0::4] = amplitudes
+    return full.copy(), int(result.nfev), result.status > 0
+
+class RunStats:
+    """
+    Timings of the processing stages of a chromatogram and per-window fit
+    information. Every record is also passed to `callback`, if given, as a
+    dict with a `type` of `"stage"` or `"window"`.
+    """
+
+    def __init__(self, callback=None) -> None:
+        self.callback = callback
+        self.stages = {}
+        self.windows = {}
 
-    for i in range(n_peaks):
-        a, loc, scale, skew = params[i * 4:(i + 1) * 4]
-        y += skewnorm.pdf(x, skew, loc, scale) * a
+    def record_stage(self, name: str, seconds: float) -> None:
+        entry = self.stages.setdefault(name, {"calls": 0, "seconds": 0.0})
+        entry["calls"] += 1
+        entry["seconds"] += seconds
+        if self.callback is not None:
+            self.callback({"type": "stage", "name": name, "seconds": seconds, "calls": entry["calls"]})
 
-    return y
+    def record_window(self, window_id, **info) -> None:
+        self.windows[window_id] = info
+        if self.callback is not None:
+            self.callback({"type": "window", "window_id": window_id, **info})
 
+    def windows_frame(self) -> pd.DataFrame:
+        """Per-window fit information as a dataframe."""
+        return pd.DataFrame([{"window_id": k, **v} for k, v in self.windows.items()])
 
-# def _sum_skewnorms(x, params):
-#     params = np.reshape(params, (-1, 4))
-#     return sum(_compute_skewnorm(x, *p) for p in params)
+    def as_dict(self) -> Dict:
+        return {"stages": {k: dict(v) for k, v in self.stages.items()},
+                "windows": {k: dict(v) for k, v in self.windows.items()}}
+
+    def __repr__(self):
+        lines = ["RunStats"]
+        for name, entry in self.stages.items():
+            lines.append(f"  {name:<24} {entry['calls']:>4} call(s) {entry['seconds']:>10.4f} s")
+        if self.windows:
+            frame = self.windows_frame()
+            lines.append(f"  {len(frame)} window(s), {int(frame['nfev'].sum())} evaluations, "
+                         f"{int((~frame['converged'].astype(bool)).sum())} not converged")
+        return "\n".join(lines)
+
+def progress_bar(iterable=None, total: int = None, desc: str = None):
+    """
+    tqdm progress bar, imported on first use. Without tqdm installed the
+    iterable is returned as it is, or None if only `total` was given.
+    """
+    try:
+        import tqdm
+    except ImportError:
+        return iterable
+    return tqdm.tqdm(iterable, total=total, desc=desc)
+
+def map_ordered(func, tasks: List[Tuple], n_jobs: int = 1, executor: Executor = None, callback=None) -> List:
+    """
+    Call `func(*task)` for every task, serially or on an executor. Results are
+    returned in the order of `tasks` regardless of completion order, and
+    `callback(1)` is called as each task finishes. With `n_jobs=-1` a process
+    pool with one worker per core is used.
+    """
+    if executor is None and (n_jobs == 1 or len(tasks) <= 1):
+        results = []
+        for task in tasks:
+            results.append(func(*task))
+            if callback is not None:
+                callback(1)
+        return results
+
+    owns_executor = executor is None
+    if owns_executor:
+        max_workers = os.cpu_count() if n_jobs in (None, -1) else n_jobs
+        executor = ProcessPoolExecutor(max_workers=min(max_workers, len(tasks)))
+
+    results = [None] * len(tasks)
+    try:
+        futures = {executor.submit(func, *task): i for i, task in enumerate(tasks)}
+        for future in as_completed(futures):
+            results[futures[future]] = future.result()
+            if callback is not None:
+                callback(1)
+    finally:
+        if owns_executor:
+            executor.shutdown(cancel_futures=True)
+    return results
+
+@contextmanager
+def shared_executor(n_jobs: int = 1, executor: Executor = None):
+    """
+    Executor shared by several `map_ordered` calls: `executor` if given,
+    otherwise a process pool for `n_jobs` other than 1, shut down on exit,
+    or None to run serially.
+    """
+    if executor is not None or n_jobs == 1:
+        yield executor
+        return
+    pool = ProcessPoolExecutor(max_workers=os.cpu_count() if n_jobs in (None, -1) else n_jobs)
+    try:
+        yield pool
+    finally:
+        pool.shutdown(cancel_futures=True)
+
+class FitCache:
+    """
+    Memoization of window fits, keyed by a hash of the window's time and
+    signal arrays, the initial guess, bounds, model and fit options. Results
+    are kept in an in-memory LRU and, if `directory` is given, as `.npy`
+    files on disk so they persist across sessions.
+    """
+
+    def __init__(self, maxsize: int = 1024, directory: str = None) -> None:
+        self.maxsize = maxsize
+        self.directory = directory
+        self._memory = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        if directory is not None:
+            os.makedirs(directory, exist_ok=True)
+
+    @staticmethod
+    def key(time_range, signal, p0, bounds, model: str = "skewnorm", **options) -> str:
+        h = hashlib.sha1()
+        for arr in (time_range, signal, p0, bounds[0], bounds[1]):
+            h.update(np.ascontiguousarray(arr, dtype=float).tobytes())
+            h.update(b"|")
+        h.update(model.encode())
+        h.update(repr(sorted(options.items())).encode())
+        return h.hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.directory, f"{key}.npy")
+
+    def get(self, key):
+        """Stored parameters for `key`, or None. Counts a hit or a miss."""
+        if key in self._memory:
+            self._memory.move_to_end(key)
+            self.hits += 1
+            return self._memory[key]
+        if self.directory is not None and os.path.exists(self._path(key)):
+            popt = np.load(self._path(key))
+            self._remember(key, popt)
+            self.hits += 1
+            return popt
+        self.misses += 1
+        return None
+
+    def put(self, key, popt) -> None:
+        popt = np.asarray(popt)
+        self._remember(key, popt)
+        if self.directory is not None:
+            np.save(self._path(key), popt)
+
+    def _remember(self, key, popt):
+        self._memory[key] = popt
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.maxsize:
+            self._memory.popitem(last=False)
+
+    def clear(self, disk: bool = False) -> None:
+        """Empty the memory tier, and the disk tier if `disk`."""
+        self._memory.clear()
+        if disk and self.directory is not None:
+            for name in os.listdir(self.directory):
+                if name.endswith(".npy"):
+                    os.remove(os.path.join(self.directory, name))
+
+    @property
+    def stats(self) -> Dict[str, int]:
+        return {"hits": self.hits, "misses": self.misses, "size": len(self._memory)}
+
+def fit_windows(tasks: List[Tuple], n_jobs: int = 1, executor: Executor = None, callback=None, cache: FitCache = None) -> List[Tuple[np.ndarray, Dict]]:
+    """
+    Run `_fit_window` over `tasks`, see `map_ordered`. With a `cache`, windows
+    fitted before with the same inputs are returned without refitting, with
+    `nfev` 0 and `cached` set in their fit information. Only fits of status
+    `"fitted"` are stored, so escalated windows are tried again.
+    """
+    if cache is None:
+        return map_ordered(_fit_window, tasks, n_jobs=n_jobs, executor=executor, callback=callback)
+
+    keys = [
+        cache.key(time_range, signal, p0, bounds, model, max_iter=max_iter, analytic_jac=analytic_jac, engine=engine, **optimizer_kwargs)
+        for time_range, signal, p0, bounds, max_iter, analytic_jac, optimizer_kwargs, model, engine, *_ in tasks
+    ]
+    results = []
+    for key in keys:
+        popt = cache.get(key)
+        results.append(None if popt is None else (popt, {"nfev": 0, "seconds": 0.0, "converged": True, "status": "fitted", "cached": True}))
+    todo = [i for i, res in enumerate(results) if res is None]
+    if callback is not None and len(todo) < len(tasks):
+        callback(len(tasks) - len(todo))
+
+    fitted = map_ordered(_fit_window, [tasks[i] for i in todo], n_jobs=n_jobs, executor=executor, callback=callback)
+    for i, (popt, info) in zip(todo, fitted):
+        if info["status"] == "fitted":
+            cache.put(keys[i], popt)
+        results[i] = (popt, info)
+    return results
 
 
 def _default_param_bounds(amplitude, location, width, time_min, time_max):
@@ -189,13 +1109,71 @@ def _adjust_param_bounds(p0, custom_bounds, default_bounds, param_order):
     return bounds
 
 
-def _generate_time_range(df, time_col, integration_window, timestep):
+def _generate_time_range(time, integration_window, timestep):
     if not integration_window:
-        return df[time_col].values
+        return time
     if len(integration_window) == 2:
         return np.arange(integration_window[0], integration_window[1], timestep)
     raise RuntimeError("Integration window must be empty or [start, stop].")
 
+def _grid_between(time, integration_window, timestep, lo, hi) -> np.ndarray:
+    """
+    The points of the integration grid, `time` or `integration_window` sampled
+    every `timestep` as by `_generate_time_range`, within [lo, hi]. Only those
+    points are generated.
+    """
+    if not integration_window:
+        return time[np.searchsorted(time, lo, side="left"):np.searchsorted(time, hi, side="right")]
+    if len(integration_window) != 2:
+        raise RuntimeError("Integration window must be empty or [start, stop].")
+    start, stop = integration_window
+    n = max(int(np.ceil((stop - start) / timestep)), 0)
+    k_lo = min(max(int(np.ceil((lo - start) / timestep)), 0), n)
+    k_hi = min(max(int(np.floor((hi - start) / timestep)) + 1, k_lo), n)
+    return start + timestep * np.arange(k_lo, k_hi)
+
+def _peak_area_max(grid, amplitude, loc, scale, skew, model: str = "skewnorm", rel_threshold: float = 1e-12) -> Tuple[float, float]:
+    """
+    Sum and maximum of a `PEAK_MODELS[model]` peak sampled on the integration
+    `grid` (`time`, `integration_window`, `timestep`). The peak is only
+    evaluated where its envelope exceeds `rel_threshold` of its height
+    bound, the neglected tails change the sum by less than that fraction.
+    """
+    peak_model = PEAK_MODELS[model]
+    left, right = peak_model.extent(scale, skew, 1 / rel_threshold)
+    x = _grid_between(*grid, loc - left, loc + right)
+    if not len(x):
+        return 0.0, 0.0
+    values = peak_model.evaluate(x, amplitude, loc, scale, skew)
+    return values.sum(), values.max()
+
+class FittedPeak(dict):
+    """
+    Properties of one fitted peak. The peak sampled on the whole integration
+    grid is computed by `reconstructed_signal()` instead of being stored, so
+    it is no longer one of the keys; `peak["reconstructed_signal"]` still
+    works but is deprecated.
+    """
+
+    def __init__(self, grid, params, model: str = "skewnorm", **props) -> None:
+        super().__init__(**props)
+        self._grid = grid
+        self._params = tuple(params)
+        self._model = model
+
+    def reconstructed_signal(self) -> np.ndarray:
+        """The fitted peak evaluated on the integration grid."""
+        return PEAK_MODELS[self._model].evaluate(_generate_time_range(*self._grid), *self._params)
+
+    def __missing__(self, key):
+        if key == "reconstructed_signal":
+            warnings.warn(
+                'peak["reconstructed_signal"] is deprecated, call peak.reconstructed_signal() instead.',
+                DeprecationWarning, stacklevel=2,
+            )
+            return self.reconstructed_signal()
+        raise KeyError(key)
+
 def _get_peak_label(self, peak_id: int) -> str:
     """
     Generate the appropriate label for a peak, using compound mapping if available.
@@ -1,11 +1,186 @@
 # File I/O: loading chromatograms, etc.
+import csv
+import hashlib
+import io
+import json
+import os
+import shutil
+import threading
+import time
+import weakref
+from datetime import datetime
 import numpy as np
 import pandas as pd
 
-def load_chromatogram(fname, cols, delimiter=',', dropna=False):
+def _find_header(f, colnames, encoding):
+    """
+    Read lines from the binary file handle `f` until one contains all of
+    `colnames` (case-insensitive) and return it. The handle is left
+    positioned at the first data line.
+    """
+    targets = [nom.lower() for nom in colnames]
+    while True:
+        raw = f.readline()
+        if not raw:
+            raise ValueError(
+                "Column name(s) not found in file provided"
+            )
+        line = raw.decode(encoding, errors="replace")
+        if _is_header(line, targets):
+            return line
+
+def _is_header(line, targets):
+    lowered = line.lower()
+    return all(nom in lowered for nom in targets)
+
+def _parse_header(line, delimiter):
+    return next(csv.reader([line.rstrip("\r\n")], delimiter=delimiter))
+
+def _read_block(source, header, colnames, delimiter, engine, encoding):
+    """Parse the numeric block following `header` from a binary handle or buffer."""
+    usecols = [name for name in header if name in colnames]
+    return pd.read_csv(
+        source,
+        header=None,
+        names=header,
+        usecols=usecols if len(usecols) == len(colnames) else None,
+        dtype={name: np.float64 for name in usecols},
+        delimiter=delimiter,
+        engine=engine,
+        encoding=encoding,
+    )
+
+def _select_columns(df, cols, dropna):
+    """Rename, clean and select the requested columns of a parsed block."""
+    if type(cols) == dict:
+        df.rename(columns = cols, inplace = True)
+        _colnames = list(cols.values())
+    else:
+        _colnames = cols
+    if dropna:
+        df.dropna(inplace=True)
+    return df[_colnames]
+
+class ChromatogramCache:
+    """
+    On-disk cache of parsed chromatograms. Each entry stores one `.npy` file
+    per column, which later loads memory-map instead of parsing text.
+
+    Entries are keyed by the absolute path, modification time and size of
+    the source file plus the load options, so edited files are re-parsed.
+    The least recently used entries are evicted once the cache grows beyond
+    `max_bytes`.
+    """
+
+    _meta_file = "meta.json"
+
+    def __init__(self, directory: str, max_bytes: int = 1_000_000_000) -> None:
+        """
+        Parameters
+        ----------
+
+        :param directory: `str`
+            Directory the cache entries are stored in, created if missing.
+        :param max_bytes: `int`
+            Size cap of the cache in bytes.
+        """
+        self.directory = directory
+        self.max_bytes = max_bytes
+        os.makedirs(directory, exist_ok=True)
+
+    def key(self, fname, **options) -> str:
+        """Cache key of `fname` loaded with `options`."""
+        stat = os.stat(fname)
+        ident = json.dumps(
+            [os.path.abspath(fname), stat.st_mtime_ns, stat.st_size, options],
+            sort_keys=True,
+            default=str,
+        )
+        return hashlib.sha1(ident.encode()).hexdigest()
+
+    def _entry(self, key):
+        return os.path.join(self.directory, key)
+
+    def get(self, key):
+        """Return the cached dataframe for `key`, memory-mapped, or None."""
+        entry = self._entry(key)
+        meta_path = os.path.join(entry, self._meta_file)
+        if not os.path.exists(meta_path):
+            return None
+        with open(meta_path) as f:
+            meta = json.load(f)
+        arrays = {
+            col: np.load(os.path.join(entry, f"{i}.npy"), mmap_mode="r")
+            for i, col in enumerate(meta["columns"])
+        }
+        # Touch the entry to mark it as recently used
+        os.utime(meta_path)
+        return pd.DataFrame(arrays, copy=False)
+
+    def put(self, key, fname, df) -> None:
+        """Store `df` parsed from `fname` under `key`, then evict if over the cap."""
+        entry = self._entry(key)
+        tmp = f"{entry}.tmp{os.getpid()}"
+        os.makedirs(tmp, exist_ok=True)
+        for i, col in enumerate(df.columns):
+            np.save(os.path.join(tmp, f"{i}.npy"), np.ascontiguousarray(df[col].values))
+        with open(os.path.join(tmp, self._meta_file), "w") as f:
+            json.dump({"path": os.path.abspath(fname), "columns": list(df.columns)}, f)
+        shutil.rmtree(entry, ignore_errors=True)
+        os.replace(tmp, entry)
+        self._evict()
+
+    def _entries(self):
+        """(last used, size, path, entry) of every complete entry."""
+        out = []
+        for name in os.listdir(self.directory):
+            # Skip the staging directories of unfinished or interrupted `put`s
+            if ".tmp" in name:
+                continue
+            entry = self._entry(name)
+            meta_path = os.path.join(entry, self._meta_file)
+            if not os.path.isfile(meta_path):
+                continue
+            with open(meta_path) as f:
+                path = json.load(f)["path"]
+            size = sum(e.stat().st_size for e in os.scandir(entry))
+            out.append((os.path.getmtime(meta_path), size, path, entry))
+        return out
+
+    def size(self) -> int:
+        """Total size of the cache in bytes."""
+        return sum(size for _, size, _, _ in self._entries())
+
+    def _evict(self) -> None:
+        entries = sorted(self._entries())
+        total = sum(size for _, size, _, _ in entries)
+        for _, size, _, entry in entries:
+            if total <= self.max_bytes:
+                break
+            shutil.rmtree(entry, ignore_errors=True)
+            total -= size
+
+    def invalidate(self, fname=None) -> int:
+        """
+        Remove the entries of `fname`, or every entry if None. Returns the
+        number of entries removed.
+        """
+        target = os.path.abspath(fname) if fname is not None else None
+        removed = 0
+        for _, _, path, entry in self._entries():
+            if target is None or path == target:
+                shutil.rmtree(entry, ignore_errors=True)
+                removed += 1
+        return removed
+
+
+def load_chromatogram(fname, cols, delimiter=',', dropna=False, engine="c", encoding="utf-8", verbose=False, cache=None):
     """
     Load and parse file containing chromatogram and returns as Pandas Dataframe.
 
+    The file is scanned line by line only until the header is found, the
+    numeric block is then parsed from the same handle in one pass.
+
     Parameters
     ----------
     :param fname: `str`
@@ -17,47 +192,271 @@ def load_chromatogram(fname, cols, delimiter=',', dropna=False):
         Delimiter character separating columns (i.e. `,`, `\t`)
     :param dropna: `bool`
         If True, drops NaN's from chromatogram.
+    :param engine: `str`
+        Parser engine passed to `pandas.read_csv`, `"c"` or `"pyarrow"`.
+    :param encoding: `str`
+        Text encoding of the file.
+    :param verbose: `bool`
+        If True, prints the load throughput.
+    :param cache: `ChromatogramCache`, optional
+        If given, the parsed columns are cached on disk and memory-mapped
+        on later loads of the unchanged file with the same options.
 
     Returns
     -------
     df : `pandas.core.frame.DataFrame`
-        The chromatograph loaded as a Pandas Dataframe
+        The chromatograph loaded as a Pandas Dataframe. The load statistics
+        (`bytes`, `seconds`, `mb_per_s`, `cached`) are stored in
+        `df.attrs["load_stats"]`.
     """
 
     if type(cols) == dict:
         _colnames = list(cols.keys())
     else:
         _colnames = cols
-    skip = 0
-    num = 0
-
-    if len(_colnames) != 0:
-        with open(fname, 'r') as f:
-            _lines = f.readlines()
-            halted = False
-            for line in _lines:
-                if np.array([nom.lower() in line.lower() for nom in _colnames]).all():
-                    halted = True
-                    num +=1
-                else:
-                    if num == 0:
-                        skip +=1
-            if not halted:
-                raise ValueError(
-                    "Column name(s) not found in file provided"
-                )
-    if num >1:
-        raise RuntimeError(
-            "More than one chromatogram is not supported. Provide file with only one chromatogram."
-        )
 
-    # Finally load in dataframe with proper parameters given
-    df = pd.read_csv(fname, skiprows=skip, delimiter=delimiter)
+    start = time.perf_counter()
+    if cache is not None:
+        cache_key = cache.key(fname, cols=cols, delimiter=delimiter, dropna=dropna, encoding=encoding)
+        df = cache.get(cache_key)
+        if df is not None:
+            return _with_load_stats(df, fname, time.perf_counter() - start, True, verbose)
+
+    with open(fname, 'rb') as f:
+        if len(_colnames) != 0:
+            header_line = _find_header(f, _colnames, encoding)
+            header = _parse_header(header_line, delimiter)
+            try:
+                df = _read_block(f, header, _colnames, delimiter, engine, encoding)
+            except ValueError as e:
+                raise RuntimeError(
+                    "Could not parse the numeric block after the header. If the file holds "
+                    f"more than one chromatogram, use `load_chromatograms` instead. ({e})"
+                ) from e
+        else:
+            df = pd.read_csv(f, delimiter=delimiter, engine=engine, encoding=encoding)
+    elapsed = time.perf_counter() - start
+
+    df = _select_columns(df, cols, dropna)
+    if cache is not None:
+        cache.put(cache_key, fname, df)
+
+    return _with_load_stats(df, fname, elapsed, False, verbose)
+
+def _with_load_stats(df, fname, elapsed, cached, verbose):
+    nbytes = os.path.getsize(fname)
+    df.attrs["load_stats"] = {
+        "bytes": nbytes,
+        "seconds": elapsed,
+        "mb_per_s": nbytes / 1e6 / elapsed if elapsed > 0 else np.inf,
+        "cached": cached,
+    }
+    if verbose:
+        source = "cache" if cached else "text"
+        print(f"Loaded {nbytes / 1e6:.2f} MB from {source} in {elapsed:.3f} s ({df.attrs['load_stats']['mb_per_s']:.1f} MB/s)")
+    return df
+
+
+def _iter_blocks(fname, cols, delimiter, dropna, engine, encoding, key):
     if type(cols) == dict:
-        df.rename(columns = cols, inplace = True)
-        _colnames = list(cols.values())
-    if dropna:
-        df.dropna(inplace=True)
+        _colnames = list(cols.keys())
+    else:
+        _colnames = cols
+    if len(_colnames) == 0:
+        raise ValueError("Column names are required to split a file into chromatograms.")
+
+    targets = [nom.lower() for nom in _colnames]
+    sep = delimiter.encode(encoding)
+    seen = set()
+    metadata, header, data = [], None, []
+    n_blocks = 0
+
+    def _emit():
+        nonlocal n_blocks
+        df = _read_block(io.BytesIO(b"".join(data)), header, _colnames, delimiter, engine, encoding)
+        df = _select_columns(df, cols, dropna)
+        df.attrs["metadata"] = list(metadata)
+        block_key = key(metadata, n_blocks) if key is not None else (metadata[0] if metadata else n_blocks)
+        if block_key in seen:
+            block_key = f"{block_key}_{n_blocks}"
+        seen.add(block_key)
+        n_blocks += 1
+        return block_key, df
+
+    with open(fname, 'rb') as f:
+        for raw in f:
+            stripped = raw.strip()
+            if header is not None:
+                if not stripped:
+                    continue
+                # Data lines are those whose first requested column is numeric
+                try:
+                    float(stripped.split(sep)[time_pos])
+                    data.append(raw)
+                    continue
+                except (ValueError, IndexError):
+                    # Lines between a header and its first data line, e.g. a
+                    # repeated header or units, belong to the same block
+                    if data:
+                        yield _emit()
+                        metadata, header, data = [], None, []
+            if not stripped:
+                continue
+            line = raw.decode(encoding, errors="replace")
+            if _is_header(line, targets):
+                header = _parse_header(line, delimiter)
+                time_pos = header.index(_colnames[0]) if _colnames[0] in header else 0
+            else:
+                metadata.append(line.strip())
+
+    if header is not None:
+        yield _emit()
+    elif n_blocks == 0:
+        raise ValueError(
+            "Column name(s) not found in file provided"
+        )
+
+def load_chromatograms(fname, cols, delimiter=',', dropna=False, engine="c", encoding="utf-8", key=None, lazy=False):
+    """
+    Load every chromatogram of a file holding several header/data blocks,
+    e.g. a sequence export, in a single scan.
+
+    Parameters
+    ----------
+    :param fname: `str`
+        The path to chromatogram file, must be text file (i.e. not `.xlsx`).
+    :param cols: `list` or `dict`
+        The columns present in the text file. Dict will allow for renaming.
+        with `key` -> `value`.
+    :param delimiter: `str`
+        Delimiter character separating columns (i.e. `,`, `\t`)
+    :param dropna: `bool`
+        If True, drops NaN's from each chromatogram.
+    :param engine: `str`
+        Parser engine passed to `pandas.read_csv`, `"c"` or `"pyarrow"`.
+    :param encoding: `str`
+        Text encoding of the file.
+    :param key: `callable`, optional
+        Called as `key(metadata_lines, block_index)` to name each block.
+        Defaults to the first metadata line before the header, or the block
+        index if there is none.
+    :param lazy: `bool`
+        If True, returns a generator of `(key, df)` pairs so only one block
+        is held in memory at a time.
+
+    Returns
+    -------
+    chromatograms : `dict` or generator
+        Dataframes keyed by their metadata, in file order. The metadata lines
+        of each block are stored in `df.attrs["metadata"]`.
+    """
+    blocks = _iter_blocks(fname, cols, delimiter, dropna, engine, encoding, key)
+    if lazy:
+        return blocks
+    return dict(blocks)
+
+
+def _json_default(value):
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    return str(value)
+
+def _write_records(destination, batch) -> None:
+    if callable(destination):
+        destination(batch)
+        return
+    text = "".join(json.dumps(entry, default=_json_default) + "\n" for entry in batch)
+    if isinstance(destination, (str, os.PathLike)):
+        with open(destination, "a") as f:
+            f.write(text)
+    else:
+        destination.write(text)
+
+def _flush_pending(destination, pending, lock) -> None:
+    """
+    Write the records left in `pending` when a `RunLog` is collected or the
+    interpreter exits. Holds no reference to the log itself, so registering
+    it does not keep the log alive; streams closed by then are skipped.
+    """
+    with lock:
+        batch = pending[:]
+        pending.clear()
+    if batch and not getattr(destination, "closed", False):
+        _write_records(destination, batch)
+
+class RunLog:
+    """
+    Buffered log of structured processing records, e.g. crop, baseline
+    correction, peak counts and stage timings of chromatograms.
+
+    Records are kept in memory and written as JSON lines once `buffer_size`
+    of them are pending, on `flush()` or `close()`, and when the log is
+    garbage collected or the interpreter exits.
+    Nothing is written on record, so logging never blocks processing on
+    disk I/O.
+    """
+
+    def __init__(self, destination=None, buffer_size: int = 100) -> None:
+        """
+        Parameters
+        ----------
+
+        :param destination: `str`, file-like or `callable`, optional
+            Path of the file records are appended to, an open text stream
+            to write them to, or a callable receiving each batch of records
+            as a list of dicts. If None, records are kept in memory in
+            `records` instead.
+        :param buffer_size: `int`
+            Number of pending records that triggers a write.
+        """
+        self.destination = destination
+        self.buffer_size = buffer_size
+        self.records = []
+        self._pending = []
+        self._lock = threading.Lock()
+        self._finalizer = None
+        if destination is not None:
+            self._finalizer = weakref.finalize(self, _flush_pending, destination, self._pending, self._lock)
+
+    def record(self, event: str, **fields) -> None:
+        """Add a record of `event` with `fields` and a timestamp."""
+        entry = {"time": datetime.now().isoformat(timespec="milliseconds"), "event": event, **fields}
+        with self._lock:
+            if self.destination is None:
+                self.records.append(entry)
+                return
+            self._pending.append(entry)
+            if len(self._pending) < self.buffer_size:
+                return
+            batch = self._pending[:]
+            self._pending.clear()
+        self._write(batch)
+
+    def flush(self) -> None:
+        """Write all pending records."""
+        with self._lock:
+            batch = self._pending[:]
+            self._pending.clear()
+        if batch:
+            self._write(batch)
+
+    def _write(self, batch) -> None:
+        _write_records(self.destination, batch)
+
+    def close(self) -> None:
+        """Flush pending records and stop writing at interpreter exit."""
+        self.flush()
+        if self._finalizer is not None:
+            self._finalizer.detach()
+
+    def to_frame(self) -> pd.DataFrame:
+        """The records of an in-memory log as a dataframe, one row per record."""
+        return pd.DataFrame(self.records)
+
+    def __enter__(self) -> "RunLog":
+        return self
 
-    df = df[_colnames]
-    return df
\ No newline at end of file
+    def __exit__(self, *exc) -> None:
+        self.close()
@@ -0,0 +1,204 @@
+# Plotting of chromatograms, imported on first use by `Chromatogram.show`
+import os
+import numpy as np
+import matplotlib.pyplot as plt
+from matplotlib.axes import Axes
+from matplotlib.figure import Figure
+import seaborn as sns
+
+from . import helpers
+
+
+def decimate_minmax(x: np.ndarray, y: np.ndarray, max_points: int | None = 4000):
+    """
+    Reduce a trace to at most about `max_points` points by keeping the
+    minimum and maximum of `y` in each of `max_points / 2` equal bins, plus
+    the end points. Drawn at screen resolution the line looks the same as
+    the full trace, peaks and spikes included.
+    """
+    n = len(y)
+    if max_points is None or n <= max_points:
+        return x, y
+    n_bins = max(max_points // 2, 1)
+    size = -(-n // n_bins)
+    padded = np.pad(y, (0, n_bins * size - n), mode="edge").reshape(n_bins, size)
+    offsets = np.arange(n_bins) * size
+    idx = np.concatenate(([0, n - 1], offsets + padded.argmin(axis=1), offsets + padded.argmax(axis=1)))
+    idx = np.unique(np.minimum(idx, n - 1))
+    return x[idx], y[idx]
+
+
+def draw(chrom, ax: Axes, time_range: list[float] = [], max_points: int | None = 4000) -> Axes:
+    """
+    Draw the chromatogram with mapped peaks and fitted signal on `ax`.
+
+    Parameters
+    ----------
+    chrom : HPLC.core.Chromatogram
+        The chromatogram to plot.
+    ax : matplotlib.axes._axes.Axes
+        Axes to draw on.
+    time_range : list[float], optional
+        [lower, upper] bounds for time axis zoom.
+    max_points : int, optional
+        Maximum number of points drawn per trace, see `decimate_minmax`.
+        None draws every point.
+
+    Returns
+    -------
+    ax : matplotlib.axes._axes.Axes
+    """
+    time = chrom._arrays[chrom.time_col]
+
+    # Only the visible part of the traces is decimated, so zooming keeps the detail
+    if len(time_range) == 2:
+        start, stop = np.searchsorted(time, time_range[0], side="left"), np.searchsorted(time, time_range[1], side="right")
+    else:
+        start, stop = 0, len(time)
+    visible = slice(max(start - 1, 0), min(stop + 1, len(time)))
+
+    # Label setup
+    ylabel_base = chrom.signal_col.split("_corrected")[0]
+
+    ax.set_xlabel(chrom.time_col)
+    ax.set_ylabel(f"{ylabel_base}")
+
+
+    # Raw chromatogram
+    ax.plot(*decimate_minmax(time[visible], chrom._arrays[chrom.signal_col][visible], max_points), "k-", label="raw chromatogram")
+
+    # Estimated background
+    if "estimated_background" in chrom._arrays:
+        ax.plot(
+            *decimate_minmax(time[visible], chrom._arrays["estimated_background"][visible], max_points),
+            color="blue",
+            label="estimated background",
+            zorder=10,
+        )
+
+    # Plot fitted peaks if available, each only over its support
+    if chrom.peaks is not None:
+        unmixed = chrom.unmixed_chromatograms
+        convolved = unmixed.sum(axis=1)
+        ax.plot(*decimate_minmax(time[visible], convolved[visible], max_points), "r--", label="inferred mixture")
+
+        for _, peak in chrom.peaks.iterrows():
+            peak_id = int(peak["peak_id"])
+            peak_label = chrom._get_peak_label(peak_id)
+            span, values = unmixed.support(peak_id - 1)
+            lo, hi = max(span.start, visible.start), min(span.stop, visible.stop)
+            if lo >= hi:
+                continue
+            ax.fill_between(
+                *decimate_minmax(time[lo:hi], values[lo - span.start:hi - span.start], max_points),
+                label=peak_label,
+                alpha=0.5,
+            )
+
+    # Zoom in on time range/ selected cropped region
+    if len(time_range) == 2:
+        ax.set_xlim(time_range)
+        yvals = chrom._arrays[chrom.signal_col][start:stop]
+        ax.set_ylim(ax.get_ylim()[0], 1.1 * yvals.max())
+
+    ax.legend() #bbox_to_anchor=(1.5, 1) Can set to static position
+    return ax
+
+
+def show(chrom, time_range: list[float] = [], max_points: int | None = 4000) -> list[Figure, Axes]:
+    """
+    Displays the chromatogram with mapped peaks and fitted signal.
+
+    Parameters
+    ----------
+    chrom : HPLC.core.Chromatogram
+        The chromatogram to plot.
+    time_range : list[float], optional
+        [lower, upper] bounds for time axis zoom.
+    max_points : int, optional
+        Maximum number of points drawn per trace, None draws every point.
+
+    Returns
+    -------
+    fig : matplotlib.figure.Figure
+    ax : matplotlib.axes._axes.Axes
+    """
+    sns.set()
+    fig, ax = plt.subplots()
+    draw(chrom, ax, time_range, max_points)
+    fig.patch.set_facecolor((0, 0, 0, 0))
+    return [fig, ax]
+
+
+def _export_figure(chrom, path, show_kwargs, savefig_kwargs):
+    """Render one chromatogram to `path` on a figure detached from pyplot, so no GUI backend is used."""
+    sns.set()
+    fig = Figure()
+    ax = fig.subplots()
+    draw(chrom, ax, **show_kwargs)
+    fig.savefig(path, **savefig_kwargs)
+    return path
+
+
+def export_figures(
+        chromatograms: list | dict,
+        directory: str,
+        fmt: str = "png",
+        n_jobs: int = 1,
+        executor=None,
+        verbose: bool = True,
+        show_kwargs: dict = {},
+        savefig_kwargs: dict = {},
+) -> list[str]:
+    """
+    Render the figures of a sequence of chromatograms to image files.
+
+    Figures are drawn without pyplot on matplotlib's non-interactive
+    canvas, serially or across worker processes, and closed as soon as they
+    are written.
+
+    Parameters
+    ----------
+    :param chromatograms: `list` or `dict`
+        The chromatograms to render. Files are named after the dict keys,
+        or the list positions.
+    :param directory: `str`
+        Directory the files are written to, created if missing.
+    :param fmt: `str`
+        Image format, e.g. `"png"` or `"svg"`.
+    :param n_jobs: `int`
+        Number of worker processes. 1 renders serially, -1 uses all cores.
+    :param executor: `concurrent.futures.Executor`, optional
+        Executor to render on instead of a new process pool.
+    :param verbose: `bool`
+        If True, shows a progress bar over the figures.
+    :param show_kwargs: `dict`
+        Keyword arguments for `draw`, e.g. `time_range` and `max_points`.
+    :param savefig_kwargs: `dict`
+        Keyword arguments for `matplotlib.figure.Figure.savefig`, e.g. `dpi`.
+
+    Returns
+    -------
+    paths : `list`
+        Path of every file written, in the order of `chromatograms`.
+    """
+    if not isinstance(chromatograms, dict):
+        chromatograms = dict(enumerate(chromatograms))
+    os.makedirs(directory, exist_ok=True)
+
+    tasks = [
+        (chrom, os.path.join(directory, f"{str(name).replace(os.sep, '_')}.{fmt}"), show_kwargs, {"format": fmt, **savefig_kwargs})
+        for name, chrom in chromatograms.items()
+    ]
+    progress = helpers.progress_bar(total=len(tasks), desc="Exporting figures") if verbose else None
+    try:
+        return helpers.map_ordered(
+            _export_figure,
+            tasks,
+            n_jobs=n_jobs,
+            executor=executor,
+            callback=progress.update if progress is not None else None,
+        )
+    finally:
+        if progress is not None:
+            progress.close()
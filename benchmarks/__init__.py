@@ -0,0 +1 @@
+# Benchmarks and synthetic chromatograms for timing the HPLC pipeline
@@ -0,0 +1,43 @@
+"""Benchmark of the SNIP baseline engines used by `Chromatogram.correct_baseline`."""
+import argparse
+import time
+
+import numpy as np
+
+from HPLC import helpers
+
+
+def _lls_signal(n_points: int, seed: int = 0) -> np.ndarray:
+    """LLS transformed test signal with a sloped baseline, noise and a few peaks."""
+    rng = np.random.default_rng(seed)
+    x = np.linspace(0, 1, n_points)
+    signal = 50 + 20 * x + rng.normal(0, 1, n_points)
+    for loc in rng.uniform(0.05, 0.95, 10):
+        signal += helpers._compute_skewnorm(x, 20, loc, 0.005, 0)
+    signal = np.clip(signal, 0, None)
+    return np.log(np.log(np.sqrt(signal + 1) + 1) + 1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--points", type=int, default=20_000, help="Number of samples.")
+    parser.add_argument("--iterations", type=int, default=100, help="Number of SNIP iterations.")
+    parser.add_argument("--repeat", type=int, default=3, help="Timed repeats per engine.")
+    args = parser.parse_args()
+
+    tform = _lls_signal(args.points)
+    results = {}
+    for name, engine in helpers.SNIP_ENGINES.items():
+        timings = []
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            results[name] = engine(tform, range(1, args.iterations + 1))
+            timings.append(time.perf_counter() - start)
+        print(f"{name:<12} best {min(timings):.4f} s over {args.repeat} repeat(s)")
+
+    identical = np.array_equal(results["loop"], results["vectorized"])
+    print(f"Engines agree: {identical}")
+
+
+if __name__ == "__main__":
+    main()
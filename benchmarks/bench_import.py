@@ -0,0 +1,50 @@
+"""Import time and memory of the HPLC core, which must not load the plotting stack."""
+import argparse
+import json
+import subprocess
+import sys
+
+# Modules only `Chromatogram.show` and progress bars need
+HEAVY_MODULES = ["matplotlib", "matplotlib.pyplot", "seaborn", "tqdm"]
+
+_PROBE = """
+import json, resource, sys, time
+start = time.perf_counter()
+import {module}
+seconds = time.perf_counter() - start
+print(json.dumps({{
+    "seconds": seconds,
+    "max_rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    "loaded": [m for m in {heavy!r} if m in sys.modules],
+}}))
+"""
+
+
+def measure(module: str = "HPLC.core") -> dict:
+    """Import `module` in a fresh interpreter and return its timing, memory and heavy modules loaded."""
+    code = _PROBE.format(module=module, heavy=HEAVY_MODULES)
+    out = subprocess.run([sys.executable, "-c", code], capture_output=True, text=True, check=True)
+    return json.loads(out.stdout)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--module", default="HPLC.core", help="Module to import.")
+    parser.add_argument("--repeat", type=int, default=5, help="Number of fresh interpreters.")
+    parser.add_argument("--max-seconds", type=float, default=None,
+                        help="Fail if the best import time exceeds this.")
+    args = parser.parse_args()
+
+    runs = [measure(args.module) for _ in range(args.repeat)]
+    best = min(run["seconds"] for run in runs)
+    loaded = sorted({m for run in runs for m in run["loaded"]})
+    print(f"import {args.module}: best {best:.3f} s over {args.repeat} run(s), "
+          f"max RSS {max(run['max_rss_mb'] for run in runs):.1f} MB")
+    print(f"Plotting/progress modules loaded: {', '.join(loaded) if loaded else 'none'}")
+
+    if loaded or (args.max_seconds is not None and best > args.max_seconds):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+"""Stage-by-stage benchmark of the HPLC pipeline on synthetic chromatograms."""
+import argparse
+import json
+import os
+import platform
+import tempfile
+import time
+import tracemalloc
+import warnings
+from datetime import datetime
+
+import numpy as np
+
+from HPLC import helpers, io
+from HPLC.core import Chromatogram
+from benchmarks.synthetic import BASELINES, synthetic_chromatogram
+
+STAGES = ["load_chromatogram", "correct_baseline", "_assign_windows", "deconvolve_peaks", "unmixed_reconstruction"]
+
+
+def _measure(func):
+    """Wall time and peak traced memory of `func()`."""
+    tracemalloc.reset_peak()
+    start_mem = tracemalloc.get_traced_memory()[0]
+    start = time.perf_counter()
+    result = func()
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1] - start_mem
+    return result, {"seconds": elapsed, "peak_memory_bytes": peak}
+
+
+def run_case(case: dict, workdir: str) -> dict:
+    """Time every pipeline stage once for the synthetic chromatogram `case`."""
+    df, truth = synthetic_chromatogram(**case)
+    fname = os.path.join(workdir, "chromatogram.csv")
+    with open(fname, "w") as f:
+        f.write("Synthetic benchmark chromatogram\n\n")
+        df.to_csv(f, index=False)
+
+    stages = {}
+    loaded, stages["load_chromatogram"] = _measure(lambda: io.load_chromatogram(fname, ["time", "signal"]))
+    chrom = Chromatogram(loaded)
+    _, stages["correct_baseline"] = _measure(lambda: chrom.correct_baseline(verbose=False))
+    _, stages["_assign_windows"] = _measure(lambda: chrom._assign_windows())
+    peak_props, stages["deconvolve_peaks"] = _measure(lambda: chrom.deconvolve_peaks(verbose=False))
+
+    params = [
+        [v["amplitude"], v["retention_time"], v["scale"], v["alpha"]]
+        for peaks in peak_props.values()
+        for v in peaks.values()
+    ]
+    t = chrom.df[chrom.time_col].values
+    _, stages["unmixed_reconstruction"] = _measure(lambda: helpers.UnmixedPeaks.from_params(t, params))
+
+    return {
+        "case": case,
+        "n_points": len(df),
+        "n_peaks_true": len(truth),
+        "n_peaks_fitted": len(params),
+        "n_windows": len(peak_props),
+        "stages": stages,
+        "total_seconds": sum(s["seconds"] for s in stages.values()),
+    }
+
+
+def run_suite(cases: list, repeat: int = 1) -> dict:
+    """Run every case `repeat` times, keeping the fastest run of each stage."""
+    tracemalloc.start()
+    results = []
+    try:
+        with tempfile.TemporaryDirectory() as workdir, warnings.catch_warnings():
+            warnings.simplefilter("ignore")
+            for case in cases:
+                runs = [run_case(case, workdir) for _ in range(repeat)]
+                best = runs[0]
+                for stage in STAGES:
+                    best["stages"][stage] = min((r["stages"][stage] for r in runs), key=lambda s: s["seconds"])
+                best["total_seconds"] = sum(s["seconds"] for s in best["stages"].values())
+                results.append(best)
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "created": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "numpy": np.__version__,
+        "machine": platform.machine(),
+        "repeat": repeat,
+        "results": results,
+    }
+
+
+def default_cases(scale: float = 1) -> list:
+    return [
+        {"duration": 20, "rate": 10 * scale, "n_peaks": 5, "overlap": 0.1, "baseline": "flat"},
+        {"duration": 30, "rate": 10 * scale, "n_peaks": 20, "overlap": 0.4, "baseline": "linear"},
+        {"duration": 60, "rate": 20 * scale, "n_peaks": 40, "overlap": 0.6, "baseline": "drift"},
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--duration", type=float, help="Run length in time units, for a single custom case.")
+    parser.add_argument("--rate", type=float, default=10, help="Samples per time unit.")
+    parser.add_argument("--peaks", type=int, default=10, help="Number of peaks.")
+    parser.add_argument("--overlap", type=float, default=0.2, help="Peak overlap in [0, 1].")
+    parser.add_argument("--baseline", choices=BASELINES, default="linear", help="Baseline shape.")
+    parser.add_argument("--scale", type=float, default=1, help="Sampling rate multiplier of the default cases.")
+    parser.add_argument("--repeat", type=int, default=3, help="Repeats per case, the fastest is kept.")
+    parser.add_argument("--output", default="benchmark_results.json", help="JSON file the results are written to.")
+    args = parser.parse_args()
+
+    if args.duration is not None:
+        cases = [{"duration": args.duration, "rate": args.rate, "n_peaks": args.peaks,
+                  "overlap": args.overlap, "baseline": args.baseline}]
+    else:
+        cases = default_cases(args.scale)
+
+    report = run_suite(cases, repeat=args.repeat)
+    with open(args.output, "w") as f:
+        json.dump(report, f, indent=2)
+
+    for res in report["results"]:
+        case = res["case"]
+        print(f"\n{res['n_points']} points, {res['n_peaks_fitted']}/{res['n_peaks_true']} peaks, "
+              f"{res['n_windows']} windows, {case['baseline']} baseline")
+        for stage, s in res["stages"].items():
+            print(f"  {stage:<24} {s['seconds']:>9.4f} s  {s['peak_memory_bytes'] / 1e6:>8.2f} MB")
+    print(f"\nResults written to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+# Synthetic chromatograms with known peaks for benchmarking
+from typing import Tuple
+import numpy as np
+import pandas as pd
+
+from HPLC import helpers
+
+BASELINES = ("flat", "linear", "drift")
+
+
+def _baseline(time: np.ndarray, shape: str, level: float) -> np.ndarray:
+    span = time[-1] - time[0] if len(time) > 1 else 1
+    x = (time - time[0]) / span
+    if shape == "flat":
+        return np.full_like(time, level)
+    if shape == "linear":
+        return level * (1 + x)
+    if shape == "drift":
+        return level * (1 + 0.5 * x + 0.2 * np.sin(2 * np.pi * 1.5 * x))
+    raise ValueError(f"Unknown baseline shape '{shape}'. Choose from {list(BASELINES)}.")
+
+
+def synthetic_chromatogram(
+        duration: float = 20,
+        rate: float = 10,
+        n_peaks: int = 10,
+        overlap: float = 0.2,
+        baseline: str = "linear",
+        baseline_level: float = 50,
+        noise: float = 0.001,
+        seed: int = 0,
+) -> Tuple[pd.DataFrame, pd.DataFrame]:
+    """
+    Chromatogram built from skew-normal peaks with `helpers._compute_skewnorm`,
+    plus a baseline and Gaussian noise.
+
+    Parameters
+    ----------
+    :param duration: `float`
+        Length of the run in time units.
+    :param rate: `float`
+        Sampling rate, samples per time unit.
+    :param n_peaks: `int`
+        Number of peaks, evenly spaced over the central 90% of the run.
+    :param overlap: `float`
+        From 0 (well separated peaks) to 1 (peak scale half the spacing).
+    :param baseline: `str`
+        Baseline shape, one of `"flat"`, `"linear"` or `"drift"`.
+    :param baseline_level: `float`
+        Baseline level at the start of the run.
+    :param noise: `float`
+        Noise standard deviation relative to the tallest peak.
+    :param seed: `int`
+        Random seed.
+
+    Returns
+    -------
+    df : `pandas.core.frame.DataFrame`
+        The chromatogram with `time` and `signal` columns.
+    truth : `pandas.core.frame.DataFrame`
+        The generating peak parameters.
+    """
+    if not 0 <= overlap <= 1:
+        raise ValueError("`overlap` must be in [0, 1]")
+
+    rng = np.random.default_rng(seed)
+    time = np.round(np.arange(0, duration, 1 / rate), 6)
+
+    spacing = 0.9 * duration / max(n_peaks, 1)
+    truth = pd.DataFrame({
+        "retention_time": 0.05 * duration + spacing * (np.arange(n_peaks) + 0.5),
+        "scale": spacing * (0.125 + 0.375 * overlap) * rng.uniform(0.8, 1.2, n_peaks),
+        "skew": rng.uniform(-2, 2, n_peaks),
+        "amplitude": rng.uniform(500, 1500, n_peaks) * spacing,
+    })
+
+    params = truth[["amplitude", "retention_time", "scale", "skew"]].values
+    signal = np.zeros_like(time)
+    for p in params:
+        signal += helpers._compute_skewnorm(time, *p)
+    height = signal.max() if n_peaks else 1
+    signal = signal + _baseline(time, baseline, baseline_level) + rng.normal(0, noise * height, len(time))
+
+    return pd.DataFrame({"time": time, "signal": signal}), truth
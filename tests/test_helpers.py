@@ -0,0 +1,41 @@
+import pytest
+
+from HPLC import helpers
+
+
+def _spans(starts, stops, merge=False):
+    starts, stops = helpers.remove_subset_ranges(starts, stops, merge=merge)
+    return list(zip(starts.tolist(), stops.tolist()))
+
+
+def test_remove_subset_ranges_keeps_first_of_identical_spans():
+    starts, stops = helpers.remove_subset_ranges([5, 0, 0], [9, 4, 4])
+    assert _spans([5, 0, 0], [9, 4, 4]) == [(5, 9), (0, 4)]
+    assert starts.dtype == stops.dtype == int
+
+
+def test_remove_subset_ranges_drops_nested_spans():
+    assert _spans([0, 2, 3, 20], [10, 5, 10, 25]) == [(0, 10), (20, 25)]
+    assert _spans([2, 0], [5, 10]) == [(0, 10)]
+
+
+def test_remove_subset_ranges_keeps_partial_overlaps_and_order():
+    assert _spans([8, 0], [15, 10]) == [(8, 15), (0, 10)]
+
+
+@pytest.mark.parametrize("merge", [False, True])
+def test_remove_subset_ranges_keeps_touching_spans_apart(merge):
+    assert _spans([0, 10], [10, 15], merge=merge) == [(0, 10), (10, 15)]
+
+
+def test_remove_subset_ranges_merges_overlaps():
+    assert _spans([8, 0, 2, 20], [15, 10, 4, 22], merge=True) == [(0, 15), (20, 22)]
+
+
+@pytest.mark.parametrize("merge", [False, True])
+def test_remove_subset_ranges_drops_empty_spans(merge):
+    assert _spans([3, 0, 7], [3, 5, 6], merge=merge) == [(0, 5)]
+    assert _spans([0, 5], [10, 5], merge=merge) == [(0, 10)]
+    assert _spans([4], [4], merge=merge) == []
+    assert _spans([], [], merge=merge) == []
+
@@ -0,0 +1,164 @@
+import gc
+import json
+import os
+import shutil
+import subprocess
+import sys
+import types
+import weakref
+from io import StringIO
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from HPLC import io
+
+COLS = {"Time": "time", "Signal": "signal"}
+
+
+def _block(name, n, offset=0.0):
+    rows = "".join(f"{i * 0.1:.1f},{i + offset}\n" for i in range(n))
+    return f"{name}\nTime,Signal\n{rows}"
+
+
+def _write(tmp_path, text):
+    fname = tmp_path / "sequence.csv"
+    fname.write_text(text)
+    return fname
+
+
+def test_load_chromatograms_names_duplicate_metadata(tmp_path):
+    fname = _write(tmp_path, _block("Sample A", 3) + "\n" + _block("Sample A", 4, 10) + _block("Sample B", 2, 20))
+    chroms = io.load_chromatograms(fname, COLS)
+
+    assert list(chroms) == ["Sample A", "Sample A_1", "Sample B"]
+    assert [len(df) for df in chroms.values()] == [3, 4, 2]
+    assert list(chroms["Sample A_1"].columns) == ["time", "signal"]
+    np.testing.assert_array_equal(chroms["Sample B"]["signal"], [20, 21])
+    assert chroms["Sample B"].attrs["metadata"] == ["Sample B"]
+
+
+def test_load_chromatograms_lazy(tmp_path):
+    fname = _write(tmp_path, _block("Sample A", 3) + _block("Sample B", 2))
+    blocks = io.load_chromatograms(fname, COLS, lazy=True)
+
+    assert isinstance(blocks, types.GeneratorType)
+    key, df = next(blocks)
+    assert key == "Sample A" and len(df) == 3
+    assert [(key, len(df)) for key, df in blocks] == [("Sample B", 2)]
+
+
+def test_load_chromatograms_header_after_header(tmp_path):
+    fname = _write(tmp_path, "Sample A\nTime,Signal\nTime,Signal\n0.0,1\n0.1,2\n0.2,3\n" + _block("Sample B", 2))
+    chroms = io.load_chromatograms(fname, COLS)
+
+    assert list(chroms) == ["Sample A", "Sample B"]
+    assert [len(df) for df in chroms.values()] == [3, 2]
+
+
+def test_load_chromatograms_without_header(tmp_path):
+    fname = _write(tmp_path, "0.0,1\n0.1,2\n")
+    with pytest.raises(ValueError, match="not found"):
+        io.load_chromatograms(fname, COLS)
+
+
+def _cached_frame(n, offset=0.0):
+    return pd.DataFrame({"time": np.arange(n) * 0.1, "signal": np.arange(n) + offset})
+
+
+def test_cache_round_trip_is_memory_mapped(tmp_path):
+    fname = _write(tmp_path, _block("Sample A", 50))
+    cache = io.ChromatogramCache(tmp_path / "cache")
+
+    parsed = io.load_chromatogram(fname, COLS, cache=cache)
+    cached = io.load_chromatogram(fname, COLS, cache=cache)
+
+    assert not parsed.attrs["load_stats"]["cached"] and cached.attrs["load_stats"]["cached"]
+    pd.testing.assert_frame_equal(cached, parsed)
+    assert isinstance(cached["signal"].values, np.memmap)
+
+
+def test_cache_evicts_least_recently_used(tmp_path):
+    cache = io.ChromatogramCache(tmp_path / "cache")
+    fname = _write(tmp_path, "source")
+    cache.put("a", fname, _cached_frame(1000))
+    entry_size = cache.size()
+    cache.max_bytes = int(2.5 * entry_size)
+
+    cache.put("b", fname, _cached_frame(1000, 1))
+    # Make "a" older than "b", then use it so that "b" is the least recently used
+    os.utime(os.path.join(cache._entry("a"), cache._meta_file), (1000, 1000))
+    os.utime(os.path.join(cache._entry("b"), cache._meta_file), (2000, 2000))
+    assert cache.get("a") is not None
+    cache.put("c", fname, _cached_frame(1000, 2))
+
+    assert cache.get("b") is None
+    assert cache.get("a") is not None and cache.get("c") is not None
+    assert cache.size() <= cache.max_bytes
+
+
+def test_cache_invalidate(tmp_path):
+    cache = io.ChromatogramCache(tmp_path / "cache")
+    first, second = _write(tmp_path, "first"), tmp_path / "second.csv"
+    second.write_text("second")
+    cache.put("a", first, _cached_frame(10))
+    cache.put("b", first, _cached_frame(10, 1))
+    cache.put("c", second, _cached_frame(10, 2))
+
+    assert cache.invalidate(first) == 2
+    assert cache.get("a") is None and cache.get("c") is not None
+    assert cache.invalidate() == 1
+    assert cache.size() == 0
+
+
+def test_cache_ignores_leftover_staging_directories(tmp_path):
+    cache = io.ChromatogramCache(tmp_path / "cache")
+    fname = _write(tmp_path, "source")
+    cache.put("a", fname, _cached_frame(10))
+    # A `put` interrupted after writing its metadata
+    shutil.copytree(cache._entry("a"), f"{cache._entry('b')}.tmp12345")
+
+    assert len(cache._entries()) == 1
+    assert cache.invalidate() == 1
+
+
+def test_run_log_is_not_kept_alive_and_flushes_when_collected(tmp_path):
+    fname = tmp_path / "run.jsonl"
+    log = io.RunLog(fname, buffer_size=10)
+    log.record("crop", start=1.0)
+    ref = weakref.ref(log)
+    del log
+    gc.collect()
+
+    assert ref() is None
+    assert [json.loads(line)["event"] for line in fname.read_text().splitlines()] == ["crop"]
+
+
+def test_run_log_skips_closed_stream_at_exit():
+    script = (
+        "import io as _io\n"
+        "from HPLC import io\n"
+        "stream = _io.StringIO()\n"
+        "log = io.RunLog(stream)\n"
+        "log.record('crop')\n"
+        "stream.close()\n"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", script], capture_output=True, text=True,
+        cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    )
+    assert result.returncode == 0
+    assert result.stderr == ""
+
+
+def test_run_log_close_stops_writing():
+    stream = StringIO()
+    log = io.RunLog(stream)
+    log.record("crop")
+    log.close()
+    log.record("peaks")
+    del log
+    gc.collect()
+
+    assert [json.loads(line)["event"] for line in stream.getvalue().splitlines()] == ["crop"]
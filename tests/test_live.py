@@ -0,0 +1,63 @@
+import warnings
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from HPLC.core import Chromatogram
+from benchmarks.synthetic import synthetic_chromatogram
+
+COLS = {"time": "time", "signal": "signal"}
+
+
+def _acquire(df, first=300, chunk=50, **settings):
+    chrom = Chromatogram(df.iloc[:0], cols=COLS)
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        chrom.append(df["time"].values[:first], df["signal"].values[:first], verbose=False, **settings)
+        for start in range(first, len(df), chunk):
+            chrom.append(df["time"].values[start:start + chunk], df["signal"].values[start:start + chunk])
+    return chrom
+
+
+def test_live_baseline_matches_one_shot():
+    df, _ = synthetic_chromatogram(duration=120, rate=10, n_peaks=6, baseline="drift", seed=0)
+    live = _acquire(df)
+
+    one_shot = Chromatogram(df, cols=COLS)
+    one_shot.correct_baseline(verbose=False)
+
+    np.testing.assert_allclose(live._arrays["estimated_background"], one_shot._arrays["estimated_background"])
+    np.testing.assert_allclose(live._arrays[live.signal_col], one_shot._arrays[one_shot.signal_col])
+
+
+def test_live_freezes_background():
+    # One early peak, then a long stretch of background only
+    df, _ = synthetic_chromatogram(duration=20, rate=10, n_peaks=1, baseline="flat", seed=0)
+    time = np.round(np.arange(0, 200, 0.1), 6)
+    signal = np.concatenate([df["signal"].values, np.full(len(time) - len(df), df["signal"].values[-1])])
+    live = _acquire(pd.DataFrame({"time": time, "signal": signal}))
+
+    assert live._live["frozen"] >= len(time) - live._live["tail"] - 50
+    assert len(live.peaks) == 1
+
+
+def test_live_baseline_only_start_matches_one_shot_peaks():
+    # The first chunk ends before the first peak rises, so its windows are noise
+    df, truth = synthetic_chromatogram(duration=120, rate=10, n_peaks=6, seed=0)
+    assert df["time"].values[50] < truth["retention_time"].min() - 2 * truth["scale"].max()
+    live = _acquire(df, first=50, chunk=50, time_budget=0.05)
+
+    one_shot = Chromatogram(df, cols=COLS)
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        one_shot.fit_peaks(verbose=False, time_budget=0.05)
+
+    assert len(live.peaks) == len(one_shot.peaks)
+    np.testing.assert_array_equal(np.sort(live._peak_indices), one_shot._peak_indices)
+
+
+def test_live_rejects_too_few_first_samples():
+    chrom = Chromatogram(pd.DataFrame({"time": [], "signal": []}), cols=COLS)
+    with pytest.raises(ValueError):
+        chrom.append([0.0], [1.0])
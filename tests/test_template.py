@@ -0,0 +1,25 @@
+import warnings
+
+import pytest
+
+from HPLC.core import Chromatogram, MethodTemplate
+from benchmarks.synthetic import synthetic_chromatogram
+
+
+@pytest.mark.parametrize("overlap, duration", [(0.2, 30), (0.5, 60), (0.8, 120)])
+def test_reinjected_template_matches_every_peak(overlap, duration):
+    # Skewed peaks, the fitted locations are off the apexes by more than the tolerance
+    df, _ = synthetic_chromatogram(duration=duration, rate=10, n_peaks=12, overlap=overlap, seed=0)
+    cols = {"time": "time", "signal": "signal"}
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore")
+        reference = Chromatogram(df, cols=cols)
+        reference.fit_peaks(verbose=False)
+        template = MethodTemplate.from_chromatogram(reference)
+
+        repeat = Chromatogram(df, cols=cols)
+        repeat.fit_peaks(verbose=False, method_template=template)
+
+    report = repeat.template_report
+    assert (report["matched"] == report["num_peaks"]).all()
+    assert report["num_peaks"].sum() == len(template.peaks)